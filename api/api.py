@@ -1,11 +1,11 @@
 import asyncio
+import contextlib
 import re
 from datetime import datetime, timezone
-from typing import Literal
+from typing import Annotated, Literal
 
-from fastapi import FastAPI, BackgroundTasks, Request
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, field_validator
+from fastapi import FastAPI, HTTPException, Request
+from pydantic import BaseModel, Field, field_validator
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -16,10 +16,42 @@ from src.monitors.dns_monitor import DNSMonitor
 from src.monitors.security_monitor import SecurityMonitor
 from src.monitors.blacklist_monitor import BlacklistMonitor
 from src.notifications.service import NotificationService
+from src.notifications.batcher import BatchingNotifier
+from src.constants import (
+    API_BATCH_MAX_DOMAINS, API_BATCH_CONCURRENCY,
+    NOTIFY_QUEUE_SIZE, NOTIFY_WORKERS, NOTIFY_BATCH_SIZE, NOTIFY_BATCH_WAIT,
+    TIMEOUT_NOTIFY_DRAIN, TIMEOUT_DOMAIN_CHECK,
+)
 
 limiter = Limiter(key_func=get_remote_address)
 
-app = FastAPI(title="DomainMate API", version="0.4.0")
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Bounded queue drained in batches: a burst of alerts becomes a few digest
+    # messages, and slow webhook providers cannot delay API responses
+    app.state.notify_q = BatchingNotifier(
+        notifier,
+        max_batch=NOTIFY_BATCH_SIZE,
+        max_wait=NOTIFY_BATCH_WAIT,
+        maxsize=NOTIFY_QUEUE_SIZE,
+        max_in_flight=NOTIFY_WORKERS,
+    )
+    app.state.notify_q.start()
+    try:
+        yield
+    finally:
+        # Give queued notifications a chance to go out before shutting down
+        await app.state.notify_q.stop(timeout=TIMEOUT_NOTIFY_DRAIN)
+        await notifier.close()
+
+
+def enqueue_notification(title: str, message: str, level: str) -> bool:
+    """Queue a notification for batched delivery. Returns False if the queue is full."""
+    return app.state.notify_q.enqueue(title, message, level)
+
+
+app = FastAPI(title="DomainMate API", version="0.4.0", lifespan=lifespan)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -68,29 +100,24 @@ class TestNotificationRequest(BaseModel):
     message: str
     level: Literal["info", "warning", "critical"] = "info"
 
-@app.post("/analyze")
-@limiter.limit("10/minute")
-async def analyze_domain(request: Request, req: AnalyzeRequest, background_tasks: BackgroundTasks):
-    """
-    Run selected monitors for a domain.
-    If critical issues are found, trigger notifications.
-    Rate limited to 10 requests/minute per IP.
-    """
+async def _analyze_core(req: AnalyzeRequest) -> dict:
+    """Run the monitors selected in ``req`` and queue a notification if issues are found."""
     checks = []
     if req.check_domain:
-        checks.append(("domain", domain_monitor.check_domain))
+        checks.append(("domain", domain_monitor))
     if req.check_ssl:
-        checks.append(("ssl", ssl_monitor.check_ssl))
+        checks.append(("ssl", ssl_monitor))
     if req.check_dns:
-        checks.append(("dns", dns_monitor.check_dns))
+        checks.append(("dns", dns_monitor))
     if req.check_security:
-        checks.append(("security", security_monitor.check_security))
+        checks.append(("security", security_monitor))
     if req.check_blacklist:
-        checks.append(("blacklist", blacklist_monitor.check_blacklist))
+        checks.append(("blacklist", blacklist_monitor))
 
-    # Monitors are blocking (whois/socket/dns): run them in threads to keep the event loop free
+    # check_async keeps the event loop free: blocking monitors (whois/socket) run in threads.
+    # The shared budget caps the response time however slow one upstream is.
     outputs = await asyncio.gather(
-        *(asyncio.to_thread(func, req.domain) for _, func in checks)
+        *(monitor.check_async(req.domain, timeout=TIMEOUT_DOMAIN_CHECK) for _, monitor in checks)
     )
     results = {name: output for (name, _), output in zip(checks, outputs)}
 
@@ -107,7 +134,7 @@ async def analyze_domain(request: Request, req: AnalyzeRequest, background_tasks
             res.get("status") in ["critical", "error"] for res in results.values()
         )
         level = "critical" if has_critical else "warning"
-        background_tasks.add_task(notifier.send_notification, f"DomainMate Alert: {req.domain}", summary, level)
+        enqueue_notification(f"DomainMate Alert: {req.domain}", summary, level)
 
     return {
         "domain": req.domain,
@@ -116,15 +143,55 @@ async def analyze_domain(request: Request, req: AnalyzeRequest, background_tasks
         "issues_found": len(issues)
     }
 
+@app.post("/analyze")
+@limiter.limit("10/minute")
+async def analyze_domain(request: Request, req: AnalyzeRequest):
+    """
+    Run selected monitors for a domain.
+    If critical issues are found, trigger notifications.
+    Rate limited to 10 requests/minute per IP.
+    """
+    return await _analyze_core(req)
+
+@app.post("/analyze/batch")
+@limiter.limit("2/minute")
+async def analyze_batch(
+    request: Request,
+    reqs: Annotated[list[AnalyzeRequest], Field(min_length=1, max_length=API_BATCH_MAX_DOMAINS)],
+):
+    """
+    Run /analyze for up to API_BATCH_MAX_DOMAINS domains in one call.
+    Domains are analyzed concurrently (at most API_BATCH_CONCURRENCY at a time);
+    results are returned in request order.
+    Rate limited to 2 requests/minute per IP.
+    """
+    semaphore = asyncio.Semaphore(API_BATCH_CONCURRENCY)
+
+    async def one(req: AnalyzeRequest) -> dict:
+        async with semaphore:
+            return await _analyze_core(req)
+
+    results = await asyncio.gather(*(one(req) for req in reqs))
+    return {"count": len(results), "results": results}
+
 @app.post("/notify/test")
 @limiter.limit("5/minute")
-async def test_notification(request: Request, req: TestNotificationRequest, background_tasks: BackgroundTasks):
+async def test_notification(request: Request, req: TestNotificationRequest):
     """
     Test the notification configuration.
+    Sent immediately, bypassing the batching queue, so the message and level
+    reach the channels exactly as requested. Responds 502 if no channel
+    delivered it (none configured, or every channel failed).
     Rate limited to 5 requests/minute per IP.
     """
-    background_tasks.add_task(notifier.send_notification, req.title, req.message, req.level)
-    return {"status": "queued", "message": "Notification task added to background queue."}
+    # dedup=False: repeating a test must send it again
+    channels = await notifier.send_notification(req.title, req.message, req.level, dedup=False)
+    if not channels:
+        raise HTTPException(
+            status_code=502,
+            detail="No channel delivered the notification (none configured for this level, or all failed).",
+        )
+    return {"status": "sent", "channels": channels, "message": f"Notification sent to {', '.join(channels)}."}
 
 @app.get("/metrics")
 def get_metrics():
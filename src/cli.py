@@ -3,9 +3,12 @@ import asyncio
 import argparse
 import sys
 import os
+import re
 import aiohttp
+import tldextract
 from urllib.parse import urlparse
 from loguru import logger
+from src.monitors.base_monitor import BaseMonitor
 from src.monitors.domain_monitor import DomainMonitor
 from src.monitors.ssl_monitor import SSLMonitor
 from src.monitors.dns_monitor import DNSMonitor
@@ -13,28 +16,31 @@ from src.monitors.security_monitor import SecurityMonitor
 from src.monitors.blacklist_monitor import BlacklistMonitor
 from src.notifications.service import NotificationService
 from src.reporting.html_generator import HTMLGenerator
+from src.utils.disk_cache import DiskCache, DEFAULT_CACHE_DIR
+from src.utils.dns_helpers import RobustResolver
 import random
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from src.constants import TIMEOUT_CLI_HTTP
+from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from src.constants import TIMEOUT_CLI_HTTP, MAX_CONCURRENT_DOMAINS, TIMEOUT_DOMAIN_CHECK
+
+# Optional scheme, then the host: everything up to a port, path, query or fragment
+_URL_RE = re.compile(r"^(?:[a-z][a-z0-9+.-]*://)?([^/:?#]+)", re.IGNORECASE)
+
+# Public Suffix List lookups use the snapshot bundled with tldextract:
+# no network fetch at startup and deterministic results in CI
+_TLD_EXTRACT = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+# Shared by every host lookup in a run (the resolver only holds configuration)
+_RESOLVER = RobustResolver(timeout=2.0)
 
 def clean_domain(raw_domain: str) -> str:
     """
     Smartly extract hostname from URLs or dirty inputs.
     e.g. 'https://www.google.com/foo' -> 'www.google.com'
     """
-    # Remove protocol
-    if "://" in raw_domain:
-        raw_domain = raw_domain.split("://")[1]
-    
-    # Remove path/params
-    raw_domain = raw_domain.split("/")[0].split("?")[0]
-    
-    # Remove port if present
-    if ":" in raw_domain:
-        raw_domain = raw_domain.split(":")[0]
-        
-    return raw_domain.strip().lower()
+    match = _URL_RE.match(raw_domain.strip())
+    return match.group(1).strip().lower() if match else ""
 
 def _validate_url(url: str, label: str) -> bool:
     """
@@ -56,35 +62,103 @@ def _validate_url(url: str, label: str) -> bool:
 
 def get_parent_domain(domain: str) -> str:
     """
-    Extracts the parent domain (SLD+TLD) from a subdomain.
+    Extracts the registrable parent domain from a subdomain using the
+    Public Suffix List, e.g. 'www.example.co.uk' -> 'example.co.uk'.
     """
-    parts = domain.split('.')
-    if len(parts) > 2:
-        return f"{parts[-2]}.{parts[-1]}"
+    ext = _TLD_EXTRACT(domain)
+    if ext.domain and ext.suffix:
+        return f"{ext.domain}.{ext.suffix}"
     return domain
 
-def get_connectable_hostname(domain: str) -> Optional[str]:
+async def resolve_connectable_async(domain: str) -> Tuple[Optional[str], Optional[str]]:
     """
-    Try to find a resolvable hostname. 
+    Try to find a resolvable hostname and return ``(hostname, ip)``.
     1. Try exact domain.
-    2. Try www.domain.
+    2. Try www.domain, only if the domain itself does not resolve.
+    Returns ``(None, None)`` if neither resolves.
     Uses RobustResolver to bypass local DNS issues.
     """
-    from src.utils.dns_helpers import RobustResolver
-    resolver = RobustResolver(timeout=2.0)
-    
     try:
-        resolver.get_ip(domain)
-        return domain
+        return domain, await _RESOLVER.aget_ip(domain)
     except Exception:
         try:
             www = f"www.{domain}"
-            resolver.get_ip(www)
+            ip = await _RESOLVER.aget_ip(www)
             logger.info(f"Root {domain} not reachable, falling back to {www}")
-            return www
+            return www, ip
         except Exception:
-            return None
- 
+            return None, None
+
+
+async def _run_monitor(monitor, target: str, domain: str, label: str, timeout: float = None, **hints) -> dict:
+    """Run a monitor check on the event loop and tag it with the original domain."""
+    res = await monitor.check_async(target, timeout=timeout, **hints)
+    if target != domain:
+        res["message"] = f"({label} {target}) {res.get('message', '')}"
+    res["domain"] = domain  # Keep original label
+    return res
+
+async def _unresolvable(domain: str, monitor: str) -> dict:
+    """Result for connection-based checks skipped because the host did not resolve."""
+    logger.warning(f"Skipping {monitor.upper()} check for {domain}: DNS resolution failed.")
+    return {
+        "domain": domain,
+        "monitor": monitor,
+        "status": "critical",
+        "message": "DNS Resolution Failed",
+        "details": {"error": "Could not resolve hostname or www subdomain"}
+    }
+
+async def check_single_domain(domain: str, monitors: dict, monitors_cfg: dict) -> list:
+    """
+    Run every enabled monitor for one domain concurrently.
+    Results are returned in monitor order (domain, ssl, dns, security, blacklist).
+    """
+    logger.info(f"Checking {domain}...")
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + TIMEOUT_DOMAIN_CHECK
+
+    # Determine best target for connection-based checks (SSL, Security).
+    # The IP found here is reused so monitors don't resolve the same name again.
+    connectable_host, connectable_ip = await resolve_connectable_async(domain)
+    parent_domain = get_parent_domain(domain)
+
+    def enabled(name: str) -> bool:
+        return monitors_cfg.get(name, {}).get("enabled", False)
+
+    # Whatever the host lookup left of the per-domain budget bounds every monitor
+    budget = max(0.1, deadline - loop.time())
+
+    checks = []
+    # 1. Domain (WHOIS always uses root/parent to avoid "No whois server found for subdomain" errors)
+    if enabled("domain"):
+        checks.append(_run_monitor(monitors["domain"], parent_domain, domain, "Parent:", timeout=budget))
+
+    # 2. SSL (Use connectable host)
+    if enabled("ssl"):
+        if connectable_host:
+            checks.append(_run_monitor(monitors["ssl"], connectable_host, domain, "Checked", timeout=budget, ip=connectable_ip))
+        else:
+            checks.append(_unresolvable(domain, "ssl"))
+
+    # 3. DNS (Always root/parent)
+    if enabled("dns"):
+        checks.append(_run_monitor(monitors["dns"], parent_domain, domain, "Parent:", timeout=budget))
+
+    # 4. Security (Use connectable host)
+    if enabled("security"):
+        if connectable_host:
+            checks.append(_run_monitor(monitors["security"], connectable_host, domain, "Checked", timeout=budget))
+        else:
+            checks.append(_unresolvable(domain, "security"))
+
+    # 5. Blacklist (Always root/IP mainly; reuse the IP only if it belongs to the domain itself)
+    if enabled("blacklist"):
+        blacklist_ip = connectable_ip if connectable_host == domain else None
+        checks.append(_run_monitor(monitors["blacklist"], domain, domain, "", timeout=budget, ip=blacklist_ip))
+
+    return list(await asyncio.gather(*checks))
+
 
 def get_demo_data():
     """Generates fake data for demo purposes."""
@@ -93,28 +167,30 @@ def get_demo_data():
         "marketing-site.com", "internal-tool.io"
     ]
     results = []
-    
-    for d in domains:
+
+    # Draw all random values up front and compute "today" once for every row
+    domain_days = random.choices([5, 45, 200, 15], k=len(domains))
+    ssl_days_all = random.choices([3, 100, 365], k=len(domains))
+    today = datetime.now(timezone.utc)
+    expiry_status = BaseMonitor.get_expiry_status
+
+    def expires_on(days: int) -> str:
+        return (today + timedelta(days=days)).strftime("%Y-%m-%d")
+
+    for d, days, ssl_days in zip(domains, domain_days, ssl_days_all):
         # 1. Domain
-        days = random.choice([5, 45, 200, 15])
-        status = "ok"
-        if days < 7: status = "critical"
-        elif days < 30: status = "warning"
-        
         results.append({
-            "domain": d, "monitor": "domain", "status": status,
-            "days_until_expiry": days, "expiration_date": (datetime.now(timezone.utc) + timedelta(days=days)).strftime("%Y-%m-%d"),
+            "domain": d, "monitor": "domain", "status": expiry_status(days),
+            "days_until_expiry": days, "expiration_date": expires_on(days),
             "message": f"Expires in {days} days"
         })
 
         # 2. SSL (one expired cert to showcase that state)
-        ssl_days = -12 if d == "legacy-system.org" else random.choice([3, 100, 365])
-        ssl_status = "ok"
-        if ssl_days < 7: ssl_status = "critical"
-        elif ssl_days < 30: ssl_status = "warning"
+        if d == "legacy-system.org":
+            ssl_days = -12
         results.append({
-            "domain": d, "monitor": "ssl", "status": ssl_status,
-            "days_until_expiry": ssl_days, "expiration_date": (datetime.now(timezone.utc) + timedelta(days=ssl_days)).strftime("%Y-%m-%d"),
+            "domain": d, "monitor": "ssl", "status": expiry_status(ssl_days),
+            "days_until_expiry": ssl_days, "expiration_date": expires_on(ssl_days),
             "message": f"Expired {-ssl_days} days ago" if ssl_days < 0 else f"Expires in {ssl_days} days"
         })
 
@@ -175,87 +251,49 @@ async def main():
     ssl_monitor = SSLMonitor()
     dns_monitor = DNSMonitor()
     security_monitor = SecurityMonitor()
-    blacklist_monitor = BlacklistMonitor()
-    notifier = NotificationService()
-    reporter = HTMLGenerator(output_dir=config.get("reports", {}).get("output_dir", "reports"))
     monitors_cfg = config.get("monitors", {})
+    blacklist_monitor = BlacklistMonitor(stop_after=monitors_cfg.get("blacklist", {}).get("stop_after"))
+    notifier = NotificationService()
+    reports_cfg = config.get("reports", {})
+    reporter = HTMLGenerator(
+        output_dir=reports_cfg.get("output_dir", "reports"),
+        gzip_json=reports_cfg.get("gzip_json", False),
+        pretty_json=reports_cfg.get("pretty_json", False),
+    )
+
+    # Optional persistent cache for slow-changing results (WHOIS, SSL expiry)
+    cache_cfg = config.get("cache", {})
+    if cache_cfg.get("enabled", False):
+        result_cache = DiskCache(cache_cfg.get("dir", DEFAULT_CACHE_DIR))
+        domain_monitor.result_cache = result_cache
+        ssl_monitor.result_cache = result_cache
+        logger.info(f"Result cache enabled at {result_cache.directory}")
+
+    monitors = {
+        "domain": domain_monitor,
+        "ssl": ssl_monitor,
+        "dns": dns_monitor,
+        "security": security_monitor,
+        "blacklist": blacklist_monitor,
+    }
 
-    all_results = []
-    
     logger.info(f"Starting check for {len(domains)} domains...")
 
-    for raw_domain in domains:
-        domain = clean_domain(raw_domain)
-        logger.info(f"Checking {domain}...")
-        
-        # Determine best target for connection-based checks (SSL, Security)
-        connectable_host = get_connectable_hostname(domain)
-        parent_domain = get_parent_domain(domain)
-        
-        # We sequentially check for now to be gentle, could be async gathered
-        # 1. Domain (WHOIS always uses root/parent)
-        if monitors_cfg.get("domain", {}).get("enabled", False):
-            try:
-                # Use parent domain for WHOIS to avoid "No whois server found for subdomain" errors
-                check_target = parent_domain
-                res = domain_monitor.check_domain(check_target)
-                res["domain"] = domain # Keep original label
-                if check_target != domain:
-                    res["message"] = f"(Parent: {check_target}) {res.get('message', '')}"
-                all_results.append(res)
-            except Exception as e:
-                logger.error(f"Domain monitor failed for {domain}: {e}")
-
-        # 2. SSL (Use connectable host)
-        if monitors_cfg.get("ssl", {}).get("enabled", False):
-            if connectable_host:
-                res = ssl_monitor.check_ssl(connectable_host)
-                if connectable_host != domain:
-                    res["message"] = f"(Checked {connectable_host}) {res.get('message', '')}"
-                res["domain"] = domain
-                all_results.append(res)
-            else:
-                logger.warning(f"Skipping SSL check for {domain}: DNS resolution failed.")
-                all_results.append({
-                    "domain": domain,
-                    "monitor": "ssl",
-                    "status": "critical",
-                    "message": "DNS Resolution Failed",
-                    "details": {"error": "Could not resolve hostname or www subdomain"}
-                })
-        
-        # 3. DNS (Always root/parent)
-        if monitors_cfg.get("dns", {}).get("enabled", False):
-            check_target = parent_domain
-            res = dns_monitor.check_dns(check_target)
-            res["domain"] = domain
-            if check_target != domain:
-                 res["message"] = f"(Parent: {check_target}) {res.get('message', '')}"
-            all_results.append(res)
-
-        # 4. Security (Use connectable host)
-        if monitors_cfg.get("security", {}).get("enabled", False):
-            if connectable_host:
-                res = security_monitor.check_security(connectable_host)
-                if connectable_host != domain:
-                    res["message"] = f"(Checked {connectable_host}) {res.get('message', '')}"
-                res["domain"] = domain
-                all_results.append(res)
-            else:
-                 logger.warning(f"Skipping Security check for {domain}: DNS resolution failed.")
-                 all_results.append({
-                    "domain": domain,
-                    "monitor": "security",
-                    "status": "critical",
-                    "message": "DNS Resolution Failed",
-                    "details": {"error": "Could not resolve hostname or www subdomain"}
-                })
-
-        # 5. Blacklist (Always root/IP mainly)
-        if monitors_cfg.get("blacklist", {}).get("enabled", False):
-            res = blacklist_monitor.check_blacklist(domain)
-            res["domain"] = domain
-            all_results.append(res)
+    # Most monitors are blocking (whois/socket/http) and run in worker threads:
+    # size the pool so every in-flight domain can run all its monitors at once.
+    # A timed-out check only abandons its await; the thread keeps a worker until
+    # its own socket timeouts expire, and later checks queue behind it.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOMAINS * len(monitors))
+    )
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOMAINS)
+
+    async def bounded_check(raw_domain: str) -> list:
+        async with semaphore:
+            return await check_single_domain(clean_domain(raw_domain), monitors, monitors_cfg)
+
+    per_domain = await asyncio.gather(*(bounded_check(d) for d in domains))
+    all_results = [res for results in per_domain for res in results]
 
     # Generate Report
     report_path = reporter.generate(all_results)
@@ -300,7 +338,16 @@ async def main():
                 f"Domains: {', '.join(affected)}\n"
                 f"Check report for details."
             )
-            await notifier.send_notification("DomainMate Alert", msg, level)
+            async with notifier:
+                await notifier.send_notification("DomainMate Alert", msg, level)
+
+def run(coro):
+    """Run ``coro`` on uvloop when it is installed, else on the stdlib event loop."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -12,9 +12,27 @@ EXPIRY_CRITICAL_DAYS = 7
 
 # ── HTTP / network timeouts (seconds) ───────────────────────────────────────
 TIMEOUT_SOCKET = 5.0          # Generic socket connections
+TIMEOUT_HTTP_CONNECT = 2.0    # TCP/TLS connect phase of monitor HTTP probes
 TIMEOUT_WEAK_PROTO = 2.0      # Weak-protocol probe (aggressive, intentional)
+TIMEOUT_RBL_QUERY = 2.0       # Per-RBL DNS query lifetime
+TIMEOUT_DNS_QUERY = 3.0       # SPF/DMARC TXT query lifetime
+TIMEOUT_WHOIS = 10            # Per WHOIS socket operation
+TIMEOUT_WHOIS_TOTAL = 20.0    # Wall-clock cap for a full WHOIS referral chain
 TIMEOUT_HTTP = 10             # aiohttp client sessions
 TIMEOUT_CLI_HTTP = 15         # CLI heartbeat / api_url uploads
+TIMEOUT_DOMAIN_CHECK = 25.0   # Wall-clock budget for all monitors of one domain (above the WHOIS cap)
+TIMEOUT_NOTIFY_DRAIN = 10.0   # API shutdown grace period to flush queued notifications
+
+# ── Concurrency ──────────────────────────────────────────────────────────────
+MAX_CONCURRENT_DOMAINS = 10   # CLI: domains checked in parallel
+API_BATCH_MAX_DOMAINS = 50    # API: domains accepted by one /analyze/batch call
+API_BATCH_CONCURRENCY = 20    # API: batch domains analyzed in parallel
+NOTIFY_QUEUE_SIZE = 1000      # API: pending notifications before new ones are dropped
+NOTIFY_WORKERS = 8            # API: notification batches sent in parallel
+NOTIFY_BATCH_SIZE = 20        # API: alerts coalesced into one notification
+NOTIFY_BATCH_WAIT = 2.0       # API: seconds to wait for more alerts before sending
+NOTIFY_HTTP_CONNECTIONS = 32  # Notifications: pooled HTTP connections per NotificationService
+NOTIFY_MAX_CONCURRENT = 16    # Notifications: domain digests in flight (half the pool: each uses several channels)
 
 # ── RBL magic return-code constants ─────────────────────────────────────────
 # Spamhaus/CBL: prefix returned when a public-DNS resolver blocks the DNSBL query
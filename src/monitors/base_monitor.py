@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from loguru import logger
 from src.constants import (
@@ -13,20 +14,61 @@ class BaseMonitor(ABC):
     Subclasses must define ``monitor_name`` and implement ``_run_check()``.
     The public ``check()`` method wraps ``_run_check()`` in a standardised
     error handler so every monitor returns a consistent result dict.
+
+    ``check_async()`` is the event-loop entry point. By default it runs the
+    blocking ``_run_check()`` in a worker thread; monitors doing natively
+    async I/O override ``_run_check_async()`` instead.
+
+    Keyword hints given to either entry point (e.g. a pre-resolved ``ip``)
+    are passed through to the monitor implementation unchanged.
+
+    Both entry points consult ``result_cache`` (a ``DiskCache``) when one is
+    attached; monitors opt in by returning a TTL from ``_result_ttl()``.
     """
 
     #: Override in each subclass (e.g. "domain", "ssl", …)
     monitor_name: str = "base"
 
+    #: Optional persistent result cache (src.utils.disk_cache.DiskCache)
+    result_cache = None
+
     # ── Public entry-point ────────────────────────────────────────────────────
 
-    def check(self, domain: str) -> dict:
+    def check(self, domain: str, **hints) -> dict:
         """Run the monitor and guarantee a well-formed result dict."""
+        cached = self._cached_result(domain)
+        if cached is not None:
+            return cached
+        try:
+            result = self._run_check(domain, **hints)
+        except Exception as e:
+            logger.error(f"Error in {self.monitor_name} monitor for {domain}: {e}")
+            return self._error_result("Check failed")
+        self._store_result(domain, result)
+        return result
+
+    async def check_async(self, domain: str, timeout: float = None, **hints) -> dict:
+        """
+        Async counterpart of ``check()`` with the same error guarantees.
+        With ``timeout``, a check still running after that many seconds is
+        reported as a warning ("timed out") instead of holding up the caller.
+        Only the await is abandoned: a ``_run_check()`` offloaded to a thread
+        cannot be cancelled and keeps its worker until its own socket
+        timeouts fire, so the executor must have room for such stragglers.
+        """
+        cached = self._cached_result(domain)
+        if cached is not None:
+            return cached
         try:
-            return self._run_check(domain)
+            result = await asyncio.wait_for(self._run_check_async(domain, **hints), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.monitor_name} monitor for {domain} exceeded its {timeout:g}s budget")
+            return self._warning_result(f"Check timed out after {timeout:g}s")
         except Exception as e:
             logger.error(f"Error in {self.monitor_name} monitor for {domain}: {e}")
             return self._error_result("Check failed")
+        self._store_result(domain, result)
+        return result
 
     # ── Abstract method ───────────────────────────────────────────────────────
 
@@ -34,6 +76,31 @@ class BaseMonitor(ABC):
     def _run_check(self, domain: str) -> dict:
         """Perform the actual check logic; raise on unrecoverable errors."""
 
+    async def _run_check_async(self, domain: str, **hints) -> dict:
+        """Default async implementation: offload ``_run_check()`` to a thread."""
+        return await asyncio.to_thread(self._run_check, domain, **hints)
+
+    # ── Result cache ──────────────────────────────────────────────────────────
+
+    def _result_ttl(self, result: dict):
+        """Seconds to cache ``result`` for, or None to skip caching (default)."""
+        return None
+
+    def _cached_result(self, domain: str):
+        if self.result_cache is None:
+            return None
+        cached = self.result_cache.get(self.monitor_name, domain)
+        if cached is not None:
+            logger.debug(f"Using cached {self.monitor_name} result for {domain}")
+        return cached
+
+    def _store_result(self, domain: str, result: dict):
+        if self.result_cache is None:
+            return
+        ttl = self._result_ttl(result)
+        if ttl:
+            self.result_cache.set(self.monitor_name, domain, result, ttl)
+
     # ── Shared helpers ────────────────────────────────────────────────────────
 
     def _ok_result(self, message: str, **extra) -> dict:
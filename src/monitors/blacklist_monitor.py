@@ -1,78 +1,130 @@
+import asyncio
+from typing import Optional
+import dns.asyncresolver
 import dns.resolver
-import socket
 from loguru import logger
 from src.monitors.base_monitor import BaseMonitor
-from src.constants import DEFAULT_RBLS, RBL_BLOCKED_PREFIX, RBL_PBL_IPS
+from src.utils.dns_cache import dns_cache
+from src.utils.dns_helpers import RobustResolver
+from src.constants import DEFAULT_RBLS, RBL_BLOCKED_PREFIX, RBL_PBL_IPS, TIMEOUT_RBL_QUERY
 
 
 class BlacklistMonitor(BaseMonitor):
     monitor_name = "blacklist"
 
-    def __init__(self, rbls: list = None):
+    def __init__(self, rbls: list = None, stop_after: Optional[int] = None):
         # Allow override from config; fall back to shared constant
         self.rbls = rbls if rbls is not None else list(DEFAULT_RBLS)
-        self.system_resolver = dns.resolver.Resolver()
-        self.system_resolver.timeout = 2.0
-        self.system_resolver.lifetime = 5.0
+        # Stop waiting once this many listings are found (None = query every RBL)
+        self.stop_after = stop_after
+        self.async_resolver = dns.asyncresolver.Resolver()
+        self.async_resolver.timeout = TIMEOUT_RBL_QUERY
+        # Domain -> IP lookups (RobustResolver holds only configuration, so one is shared)
+        self.ip_resolver = RobustResolver(timeout=2.0)
 
-    def check_blacklist(self, domain: str) -> dict:
-        """Resolve domain to IP and check against common RBLs."""
-        return self.check(domain)
+    def check_blacklist(self, domain: str, ip: str = None) -> dict:
+        """
+        Resolve domain to IP and check against common RBLs.
+        Pass ``ip`` when the domain was already resolved to skip the lookup.
+        """
+        return self.check(domain, ip=ip)
 
-    def _run_check(self, domain: str) -> dict:
-        from src.utils.dns_helpers import RobustResolver
-        resolver = RobustResolver(timeout=2.0)
+    async def check_blacklist_async(self, domain: str, ip: str = None) -> dict:
+        """Async variant of ``check_blacklist``: all RBLs are queried concurrently."""
+        return await self.check_async(domain, ip=ip)
 
-        # 1. Resolve Domain to IP
-        try:
-            ip = resolver.get_ip(domain)
-        except Exception as e:
-            return self._error_result(f"Could not resolve domain: {e}")
+    def _run_check(self, domain: str, ip: str = None) -> dict:
+        return asyncio.run(self._run_check_async(domain, ip))
+
+    async def _run_check_async(self, domain: str, ip: str = None) -> dict:
+        # 1. Resolve Domain to IP (unless the caller already did)
+        if ip is None:
+            try:
+                ip = await self.ip_resolver.aget_ip(domain)
+            except Exception as e:
+                return self._error_result(f"Could not resolve domain: {e}")
 
         # 2. Prepare Reverse IP for DNSBL query (1.2.3.4 -> 4.3.2.1)
         reversed_ip = ".".join(reversed(ip.split(".")))
 
+        # 3. Query all RBLs concurrently: worst case is one RBL timeout, not the sum.
+        # Results are folded as they arrive so the check can stop at ``stop_after`` hits.
+        tasks = [
+            asyncio.ensure_future(self._tagged_query(reversed_ip, rbl, domain))
+            for rbl in self.rbls
+        ]
         listed_in = []
         errors = []
+        checked = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                rbl, outcome = await next_done
+                if isinstance(outcome, Exception):
+                    errors.append(f"{rbl}: {outcome}")
+                    continue
+                # Only RBLs that actually answered count as checked
+                checked += 1
+                if outcome:
+                    listed_in.append(rbl)
+                    if self.stop_after and len(listed_in) >= self.stop_after:
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
 
-        # 3. Query RBLs
-        for rbl in self.rbls:
-            query = f"{reversed_ip}.{rbl}"
-            try:
-                answers = self.system_resolver.resolve(query, "A")
-                for rdata in answers:
-                    result_ip = rdata.to_text()
-
-                    # Query blocked / refused (e.g. 127.255.255.x via public DNS)
-                    if result_ip.startswith(RBL_BLOCKED_PREFIX):
-                        logger.warning(
-                            f"RBL {rbl} blocked query for {domain} (Code: {result_ip}). Using public DNS?"
-                        )
-                        continue
-
-                    # PBL / Policy listings — dynamic/consumer IPs, not actionable
-                    if result_ip in RBL_PBL_IPS:
-                        continue
-
-                    if rbl not in listed_in:
-                        listed_in.append(rbl)
-
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
-                # Not listed — expected result
-                pass
-            except Exception as e:
-                errors.append(f"{rbl}: {e}")
-
-        status = "critical" if listed_in else "ok"
+        # Report listings in configured RBL order, not arrival order
+        listed_in.sort(key=self.rbls.index)
+        if listed_in:
+            status, message = "critical", f"Listed in {len(listed_in)} blacklists"
+        elif errors and not checked:
+            # Nothing answered: "clean" would be a guess, not a result
+            status, message = "warning", f"All {len(errors)} RBL lookups failed"
+        elif errors:
+            status, message = "ok", f"Not listed in any common RBL ({len(errors)} lookups failed)"
+        else:
+            status, message = "ok", "Not listed in any common RBL"
         return {
             "monitor": self.monitor_name,
             "status": status,
             "ip": ip,
             "listed_in": listed_in,
-            "checked_rbls": len(self.rbls),
-            "message": (
-                f"Listed in {len(listed_in)} blacklists"
-                if listed_in
-                else "Not listed in any common RBL"
-            ),
+            "checked_rbls": checked,
+            "errors": errors,
+            "message": message,
         }
+
+    async def _tagged_query(self, reversed_ip: str, rbl: str, domain: str) -> tuple:
+        """``_query_rbl`` that never raises: returns ``(rbl, listed_or_exception)``."""
+        try:
+            return rbl, await self._query_rbl(reversed_ip, rbl, domain)
+        except Exception as e:
+            return rbl, e
+
+    async def _query_rbl(self, reversed_ip: str, rbl: str, domain: str) -> bool:
+        """Return True if the IP is actionably listed in ``rbl``; raise on lookup errors."""
+        query = f"{reversed_ip}.{rbl}"
+        try:
+            answers = await dns_cache.aresolve(
+                query, "A", lambda: self.async_resolver.resolve(query, "A", lifetime=TIMEOUT_RBL_QUERY)
+            )
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            # Not listed — expected result
+            return False
+
+        listed = False
+        for rdata in answers:
+            result_ip = rdata.to_text()
+
+            # Query blocked / refused (e.g. 127.255.255.x via public DNS)
+            if result_ip.startswith(RBL_BLOCKED_PREFIX):
+                logger.warning(
+                    f"RBL {rbl} blocked query for {domain} (Code: {result_ip}). Using public DNS?"
+                )
+                continue
+
+            # PBL / Policy listings — dynamic/consumer IPs, not actionable
+            if result_ip in RBL_PBL_IPS:
+                continue
+
+            listed = True
+        return listed
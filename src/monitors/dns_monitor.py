@@ -1,16 +1,32 @@
+import asyncio
+import dns.asyncresolver
 import dns.resolver
 from loguru import logger
 from src.monitors.base_monitor import BaseMonitor
+from src.utils.dns_cache import dns_cache
+from src.constants import TIMEOUT_DNS_QUERY
 
 
 class DNSMonitor(BaseMonitor):
     monitor_name = "dns"
 
+    def __init__(self):
+        # Shared across checks: parsing resolv.conf once instead of per query
+        self.resolver = dns.asyncresolver.Resolver()
+        self.resolver.lifetime = TIMEOUT_DNS_QUERY
+
     def check_dns(self, domain: str) -> dict:
         """Check DNS records for SPF, DMARC."""
         return self.check(domain)
 
+    async def check_dns_async(self, domain: str) -> dict:
+        """Async variant of ``check_dns``: SPF and DMARC are queried concurrently."""
+        return await self.check_async(domain)
+
     def _run_check(self, domain: str) -> dict:
+        return asyncio.run(self._run_check_async(domain))
+
+    async def _run_check_async(self, domain: str) -> dict:
         results: dict = {
             "monitor": self.monitor_name,
             "spf": {"status": "missing", "record": None},
@@ -18,30 +34,31 @@ class DNSMonitor(BaseMonitor):
             "txt": [],
         }
 
+        dmarc_name = f"_dmarc.{domain}"
+        txt_records, dmarc_records = await asyncio.gather(
+            self._resolve_txt(domain),
+            self._resolve_txt(dmarc_name),
+            return_exceptions=True,
+        )
+
         # SPF Check
-        try:
-            txt_records = dns.resolver.resolve(domain, "TXT")
+        if isinstance(txt_records, Exception):
+            self._log_lookup_error(f"TXT/SPF lookup failed for {domain}", txt_records)
+        else:
             for r in txt_records:
                 txt_val = b"".join(r.strings).decode("utf-8", errors="replace")
                 results["txt"].append(txt_val)
                 if txt_val.startswith("v=spf1"):
                     results["spf"] = {"status": "present", "record": txt_val}
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
-            pass
-        except Exception as e:
-            logger.warning(f"TXT/SPF lookup failed for {domain}: {e}")
 
         # DMARC Check (_dmarc.domain)
-        try:
-            dmarc_records = dns.resolver.resolve(f"_dmarc.{domain}", "TXT")
+        if isinstance(dmarc_records, Exception):
+            self._log_lookup_error(f"DMARC lookup failed for {domain}", dmarc_records)
+        else:
             for r in dmarc_records:
                 txt_val = b"".join(r.strings).decode("utf-8", errors="replace")
                 if txt_val.startswith("v=DMARC1"):
                     results["dmarc"] = {"status": "present", "record": txt_val}
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
-            pass
-        except Exception as e:
-            logger.warning(f"DMARC lookup failed for {domain}: {e}")
 
         missing = [k for k in ("spf", "dmarc") if results[k]["status"] == "missing"]
         results["status"] = "warning" if missing else "ok"
@@ -51,3 +68,12 @@ class DNSMonitor(BaseMonitor):
             else "SPF and DMARC present"
         )
         return results
+
+    async def _resolve_txt(self, qname: str):
+        return await dns_cache.aresolve(qname, "TXT", lambda: self.resolver.resolve(qname, "TXT"))
+
+    @staticmethod
+    def _log_lookup_error(context: str, error: Exception):
+        # NXDOMAIN / NoAnswer simply mean "no record" — only log real failures
+        if not isinstance(error, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)):
+            logger.warning(f"{context}: {error}")
@@ -1,17 +1,39 @@
+import asyncio
 import whois
 from datetime import datetime, timezone
 from src.monitors.base_monitor import BaseMonitor
+from src.utils.disk_cache import expiry_cache_ttl
+from src.constants import TIMEOUT_WHOIS, TIMEOUT_WHOIS_TOTAL
 
 
 class DomainMonitor(BaseMonitor):
     monitor_name = "domain"
 
+    #: Wall-clock budget for one lookup (IANA referral + registry + registrar)
+    timeout: float = TIMEOUT_WHOIS_TOTAL
+
     def check_domain(self, domain: str) -> dict:
         """Check domain expiration and status using WHOIS."""
         return self.check(domain)
 
+    async def check_domain_async(self, domain: str) -> dict:
+        """Async variant of ``check_domain`` with a hard wall-clock timeout."""
+        return await self.check_async(domain)
+
+    def _result_ttl(self, result: dict):
+        # Expiry dates move slowly and WHOIS servers rate-limit: cache between runs
+        return expiry_cache_ttl(result)
+
+    async def _run_check_async(self, domain: str) -> dict:
+        # python-whois is blocking: run it in a thread and stop waiting once the
+        # budget is spent, so a slow registrar cannot stall the whole scan
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(self._run_check, domain), self.timeout)
+        except asyncio.TimeoutError:
+            return self._error_result(f"WHOIS lookup timed out after {self.timeout:g}s")
+
     def _run_check(self, domain: str) -> dict:
-        w = whois.whois(domain)
+        w = whois.whois(domain, timeout=TIMEOUT_WHOIS)
 
         # Handle list of dates (some registrars return a list)
         expiration_date = w.expiration_date
@@ -1,18 +1,51 @@
 import requests
 import socket
 import ssl
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
 from loguru import logger
 from src.monitors.base_monitor import BaseMonitor
-from src.constants import TIMEOUT_SOCKET, TIMEOUT_WEAK_PROTO
+from src.constants import TIMEOUT_SOCKET, TIMEOUT_WEAK_PROTO, TIMEOUT_HTTP_CONNECT
+
+# Headers that disclose server software, and the issue reported for each
+_LEAK_HDRS = {
+    "Server": "Server Version Disclosed: {}",
+    "X-Powered-By": "Tech Stack Disclosed: {}",
+    "X-AspNet-Version": "ASP.NET Version Disclosed: {}",
+}
 
 
 class SecurityMonitor(BaseMonitor):
     monitor_name = "security"
 
+    #: Pooled connections kept per scheme (shared by concurrent checks)
+    pool_size = 32
+    #: Identifies the probe in target access logs instead of python-requests/x.y
+    user_agent = "domainmate/1.0"
+
+    def __init__(self):
+        # One pooled session for every probe: redirects and retries reuse
+        # open connections instead of paying a new TCP+TLS handshake each time
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = self.user_agent
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=Retry(total=1, backoff_factor=0.2),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def check_security(self, domain: str) -> dict:
         """Comprehensive security checks: Headers, Info Leakage, and Weak Protocols."""
         return self.check(domain)
 
+    async def check_security_async(self, domain: str) -> dict:
+        """Async variant of ``check_security``: probes for many domains overlap on the pooled session."""
+        return await self.check_async(domain)
+
     def _run_check(self, domain: str) -> dict:
         checks = {}
         issues = []
@@ -21,7 +54,9 @@ class SecurityMonitor(BaseMonitor):
         url = f"https://{domain}"
         try:
             # allow_redirects: without it headers are read from the 3xx response, not the final page
-            response = requests.head(url, timeout=TIMEOUT_SOCKET, allow_redirects=True)
+            response = self.session.head(
+                url, timeout=(TIMEOUT_HTTP_CONNECT, TIMEOUT_SOCKET), allow_redirects=True
+            )
             headers = response.headers
 
             security_headers = {
@@ -88,38 +123,39 @@ class SecurityMonitor(BaseMonitor):
         *remote server* accepts deprecated protocol versions, not validating
         its certificate.
         """
-        weak_protocols = []
         protocols_to_test = []
         if hasattr(ssl, "PROTOCOL_TLSv1"):
             protocols_to_test.append(("TLSv1.0", ssl.PROTOCOL_TLSv1))
         if hasattr(ssl, "PROTOCOL_TLSv1_1"):
             protocols_to_test.append(("TLSv1.1", ssl.PROTOCOL_TLSv1_1))
+        if not protocols_to_test:
+            return []
 
-        for name, proto_version in protocols_to_test:
+        def probe(name: str, proto_version) -> str | None:
             try:
                 context = ssl.SSLContext(proto_version)
                 context.verify_mode = ssl.CERT_NONE  # intentional: testing remote protocol support
                 with socket.create_connection((domain, 443), timeout=TIMEOUT_WEAK_PROTO) as sock:
                     with context.wrap_socket(sock, server_hostname=domain):
-                        weak_protocols.append(name)
+                        return name
             except (ssl.SSLError, OSError):
                 # Connection refused or protocol rejected — secure behaviour
-                pass
+                return None
             except Exception as e:
                 logger.debug(f"Weak-protocol probe for {domain} ({name}) raised unexpected error: {e}")
+                return None
 
-        return weak_protocols
+        # Probes run in parallel: worst case is one handshake timeout, not one per protocol
+        with ThreadPoolExecutor(max_workers=len(protocols_to_test)) as executor:
+            results = executor.map(lambda p: probe(*p), protocols_to_test)
+            return [name for name in results if name]
 
     def check_info_leakage(self, headers: dict) -> list:
         """
         Check for info leakage in headers (Server, X-Powered-By).
         OWASP A05:2021 - Security Misconfiguration.
         """
-        leaks = []
-        if "Server" in headers:
-            leaks.append(f"Server Version Disclosed: {headers['Server']}")
-        if "X-Powered-By" in headers:
-            leaks.append(f"Tech Stack Disclosed: {headers['X-Powered-By']}")
-        if "X-AspNet-Version" in headers:
-            leaks.append(f"ASP.NET Version Disclosed: {headers['X-AspNet-Version']}")
-        return leaks
+        # Header names are case-insensitive; requests already returns a CaseInsensitiveDict
+        if not isinstance(headers, CaseInsensitiveDict):
+            headers = CaseInsensitiveDict(headers)
+        return [tmpl.format(headers[h]) for h, tmpl in _LEAK_HDRS.items() if h in headers]
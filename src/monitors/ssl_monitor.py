@@ -1,57 +1,86 @@
+import asyncio
+import contextlib
 import ssl
-import socket
 from datetime import datetime, timezone
 from loguru import logger
 from src.monitors.base_monitor import BaseMonitor
+from src.utils.disk_cache import expiry_cache_ttl
+from src.constants import TIMEOUT_SOCKET
 
 
 class SSLMonitor(BaseMonitor):
     monitor_name = "ssl"
 
-    def check_ssl(self, domain: str, port: int = 443) -> dict:
-        """Check SSL certificate validity and expiration."""
-        return self.check(domain)
-
-    def _run_check(self, domain: str, port: int = 443) -> dict:
-        context = ssl.create_default_context()
+    def __init__(self):
+        # One context for every handshake: loading the CA bundle is the costly part,
+        # and an SSLContext is safe to share between connections and threads
+        self.context = ssl.create_default_context()
         # Explicitly refuse TLS 1.0 and 1.1 — require TLS 1.2 as a minimum
-        context.minimum_version = ssl.TLSVersion.TLSv1_2
+        self.context.minimum_version = ssl.TLSVersion.TLSv1_2
+
+    def check_ssl(self, domain: str, port: int = 443, ip: str = None) -> dict:
+        """
+        Check SSL certificate validity and expiration.
+        ``ip`` skips the hostname lookup; SNI and verification still use ``domain``.
+        """
+        return self.check(domain, port=port, ip=ip)
+
+    async def check_ssl_async(self, domain: str, port: int = 443, ip: str = None) -> dict:
+        """Async variant of ``check_ssl``: many handshakes can be gathered concurrently."""
+        return await self.check_async(domain, port=port, ip=ip)
 
-        conn = None
+    def _result_ttl(self, result: dict):
+        return expiry_cache_ttl(result)
+
+    def _run_check(self, domain: str, port: int = 443, ip: str = None) -> dict:
+        return asyncio.run(self._run_check_async(domain, port, ip))
+
+    async def _run_check_async(self, domain: str, port: int = 443, ip: str = None) -> dict:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(ip or domain, port, ssl=self.context, server_hostname=domain),
+            timeout=TIMEOUT_SOCKET,
+        )
         try:
-            raw_sock = socket.create_connection((domain, port), timeout=5.0)
-            conn = context.wrap_socket(raw_sock, server_hostname=domain)
-            cert = conn.getpeercert()
+            cert = writer.get_extra_info("peercert")
+        finally:
+            writer.close()
+            # Don't let a peer that never answers close_notify hold the check open
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(writer.wait_closed(), timeout=TIMEOUT_SOCKET)
 
-            not_after_str = cert.get("notAfter")
-            if not not_after_str:
-                return self._error_result("Certificate missing notAfter field")
+        return self._parse_cert(domain, cert or {})
 
-            ssl_date_fmt = r"%b %d %H:%M:%S %Y %Z"
-            expiration_date = datetime.strptime(not_after_str, ssl_date_fmt).replace(
-                tzinfo=timezone.utc
+    def _parse_cert(self, domain: str, cert: dict) -> dict:
+        not_after_str = cert.get("notAfter")
+        if not not_after_str:
+            return self._error_result("Certificate missing notAfter field")
+
+        # cert_time_to_seconds parses the fixed OpenSSL "Mon DD HH:MM:SS YYYY GMT"
+        # form itself, so it is faster than strptime and independent of LC_TIME
+        try:
+            expiration_date = datetime.fromtimestamp(
+                ssl.cert_time_to_seconds(not_after_str), tz=timezone.utc
             )
+        except ValueError:
+            return self._error_result(f"Unparseable notAfter field: {not_after_str}")
 
-            days_until_expiry = (expiration_date - datetime.now(timezone.utc)).days
-            status = self.get_expiry_status(days_until_expiry)
-
-            # Safely parse issuer
-            try:
-                issuer = dict(x[0] for x in cert.get("issuer", []))
-                common_name = issuer.get("commonName", "Unknown")
-            except Exception:
-                logger.warning(f"Could not parse issuer for {domain}")
-                common_name = "Unknown"
-
-            return {
-                "monitor": self.monitor_name,
-                "status": status,
-                "message": f"Expires in {days_until_expiry} days",
-                "expiration_date": expiration_date.strftime("%Y-%m-%d"),
-                "days_until_expiry": days_until_expiry,
-                "issuer": common_name,
-                "version": cert.get("version"),
-            }
-        finally:
-            if conn is not None:
-                conn.close()
+        days_until_expiry = (expiration_date - datetime.now(timezone.utc)).days
+        status = self.get_expiry_status(days_until_expiry)
+
+        # Safely parse issuer
+        try:
+            issuer = dict(x[0] for x in cert.get("issuer", []))
+            common_name = issuer.get("commonName", "Unknown")
+        except Exception:
+            logger.warning(f"Could not parse issuer for {domain}")
+            common_name = "Unknown"
+
+        return {
+            "monitor": self.monitor_name,
+            "status": status,
+            "message": f"Expires in {days_until_expiry} days",
+            "expiration_date": expiration_date.strftime("%Y-%m-%d"),
+            "days_until_expiry": days_until_expiry,
+            "issuer": common_name,
+            "version": cert.get("version"),
+        }
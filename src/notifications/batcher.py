@@ -0,0 +1,104 @@
+import asyncio
+from loguru import logger
+from src.notifications.service import NotificationService
+
+# Severity order used to pick the level of a coalesced batch
+_LEVEL_RANK = {"info": 0, "warning": 1, "critical": 2}
+
+
+class BatchingNotifier:
+    """
+    Coalesce queued alerts into digest notifications.
+
+    Alerts are queued with ``enqueue``. A single collector waits for an alert,
+    gathers more for up to ``max_wait`` seconds (or until ``max_batch``), and
+    sends them as one ``send_notification`` call; up to ``max_in_flight``
+    batches are delivered concurrently so a slow provider does not stall
+    collection. A burst of N alerts costs about N / max_batch sends, not N.
+    """
+
+    def __init__(
+        self,
+        notifier: NotificationService,
+        max_batch: int = 20,
+        max_wait: float = 2.0,
+        maxsize: int = 1000,
+        max_in_flight: int = 1,
+    ):
+        self.notifier = notifier
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._collector = None
+        self._sends: set = set()
+
+    def enqueue(self, title: str, message: str, level: str = "info") -> bool:
+        """Queue an alert without blocking. Returns False if the queue is full."""
+        try:
+            self.queue.put_nowait((title, message, level))
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"Notification queue full, dropping '{title}'")
+            return False
+
+    def start(self):
+        self._collector = asyncio.create_task(self._collect_loop())
+
+    async def stop(self, timeout: float = None):
+        """Deliver pending alerts (waiting at most ``timeout`` seconds), then stop."""
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.queue.qsize()} queued notification(s) dropped on shutdown")
+        tasks = [self._collector, *self._sends] if self._collector else list(self._sends)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._collector = None
+
+    async def _collect_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                # Not wait_for(queue.get()): before Python 3.12 it can drop an
+                # item dequeued just as the timeout fires. A getter that is
+                # still pending after asyncio.wait holds no item and is safe to cancel.
+                getter = asyncio.ensure_future(self.queue.get())
+                try:
+                    await asyncio.wait({getter}, timeout=remaining)
+                finally:
+                    timed_out = not getter.done()
+                    if timed_out:
+                        getter.cancel()
+                if timed_out:
+                    break
+                batch.append(getter.result())
+            await self._in_flight.acquire()
+            task = asyncio.create_task(self._send(batch))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _send(self, batch: list):
+        try:
+            await self.notifier.send_notification(*self.render(batch))
+        except Exception as e:
+            logger.error(f"Failed to send {len(batch)} batched notification(s): {e}")
+        finally:
+            self._in_flight.release()
+            for _ in batch:
+                self.queue.task_done()
+
+    @staticmethod
+    def render(batch: list) -> tuple:
+        """Return ``(title, message, level)`` for one notification covering ``batch``."""
+        if len(batch) == 1:
+            return batch[0]
+        level = max((lvl for _, _, lvl in batch), key=lambda lvl: _LEVEL_RANK.get(lvl, 0))
+        message = "\n\n".join(f"**{title}**\n{message}" for title, message, _ in batch)
+        return f"DomainMate: {len(batch)} alerts", message, level
@@ -1,128 +1,216 @@
+import asyncio
 import json
 import os
-from datetime import datetime, timedelta, timezone
+import sqlite3
+import time
+from datetime import datetime, timezone
 from loguru import logger
 from collections import defaultdict
-from filelock import FileLock
+from itertools import chain
 from src.notifications.service import NotificationService
+from src.constants import NOTIFY_MAX_CONCURRENT
+
+RESEND_AFTER_SECONDS = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    issue_id   TEXT PRIMARY KEY,
+    first_seen REAL NOT NULL,  -- Unix epoch seconds
+    last_sent  REAL NOT NULL,
+    count      INTEGER NOT NULL,
+    monitor    TEXT,
+    domain     TEXT
+)
+"""
+
+# Digest tag per status; anything that is not critical is reported as a warning
+_TAG = {"critical": "[CRIT]"}.get
+
+
+def _alert_lines(alert: dict):
+    """Digest lines for one alert: a summary line, then up to three detail lines."""
+    count = alert.get("alert_count", 0)
+    repeat = f"(Repeated {count}x)" if count > 1 else "(New)"
+    yield f"{_TAG(alert.get('status'), '[WARN]')} **{alert['monitor'].upper()}**: {alert.get('message', 'Unknown Error')} {repeat}"
+    details = alert.get("details")
+    if isinstance(details, list):
+        yield from (f"   - {d}" for d in details[:3])
+    elif isinstance(details, str):
+        yield f"   - {details}"
+
 
 class NotificationManager:
-    def __init__(self, config: dict, state_file: str = "reports/notification_state.json"):
+    def __init__(self, config: dict, state_file: str = "reports/notification_state.db"):
         self.config = config
         self.state_file = state_file
-        self._lock = FileLock(f"{state_file}.lock")
         self.service = NotificationService(config)
-        self.state = self._load_state()
-
-    def _load_state(self) -> dict:
-        if os.path.exists(self.state_file):
-            try:
-                with self._lock:
-                    with open(self.state_file, "r") as f:
-                        return json.load(f)
-            except Exception as e:
-                logger.error(f"Failed to load notification state: {e}")
-        return {}
-
-    def _save_state(self):
+        # SQLite keeps per-issue state as rows: each scan does O(1) upserts
+        # instead of re-serializing and rewriting the whole state file.
+        # WAL lets readers proceed while a scan writes, across processes too.
+        directory = os.path.dirname(state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(state_file)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(_SCHEMA)
+        self.db.commit()
+        self._import_json_state(os.path.splitext(state_file)[0] + ".json")
+
+    def close(self):
+        self.db.close()
+
+    def _import_json_state(self, json_file: str):
+        """
+        One-time import of the JSON state written by earlier versions, so open
+        issues are not alerted again after the upgrade. The file is renamed
+        to ``*.imported`` afterwards.
+        """
+        if not os.path.exists(json_file):
+            return
         try:
-            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-            with self._lock:
-                with open(self.state_file, "w") as f:
-                    json.dump(self.state, f, indent=2, default=str)
+            with open(json_file, "r") as f:
+                legacy = json.load(f)
+
+            def epoch(iso: str) -> float:
+                ts = datetime.fromisoformat(iso)
+                if ts.tzinfo is None:
+                    ts = ts.replace(tzinfo=timezone.utc)
+                return ts.timestamp()
+
+            rows = [
+                (issue_id, epoch(data["first_seen"]), epoch(data["last_sent"]), data["count"],
+                 data.get("monitor"), data.get("domain"))
+                for issue_id, data in legacy.items()
+            ]
+            with self.db:
+                # Rows already in the database are newer than the JSON file
+                self.db.executemany("INSERT OR IGNORE INTO state VALUES (?, ?, ?, ?, ?, ?)", rows)
+            os.replace(json_file, f"{json_file}.imported")
+            logger.info(f"Imported {len(rows)} issues from {json_file}")
         except Exception as e:
-            logger.error(f"Failed to save notification state: {e}")
-
-    def _get_issue_id(self, result: dict) -> str:
-        """Create a unique ID for an issue (Domain + Monitor Type)."""
-        return f"{result['domain']}:{result['monitor']}"
+            logger.error(f"Failed to import notification state from {json_file}: {e}")
+
+    @property
+    def state(self) -> dict:
+        """Snapshot of the tracked issues, keyed by issue ID."""
+        rows = self.db.execute(
+            "SELECT issue_id, first_seen, last_sent, count, monitor, domain FROM state"
+        )
+        return {
+            issue_id: {"first_seen": first_seen, "last_sent": last_sent, "count": count,
+                       "monitor": monitor, "domain": domain}
+            for issue_id, first_seen, last_sent, count, monitor, domain in rows
+        }
 
     async def process_and_send(self, results: list):
         """
         Process scan results, update state, aggregate, and send notifications.
         """
-        now = datetime.now(timezone.utc)
-
-        # 1. Identify current issues
-        current_issues = {}
-        alerts_to_send = []
-
-        for res in results:
-            if res.get("status") in ["critical", "error", "warning"]:
-                issue_id = self._get_issue_id(res)
-                current_issues[issue_id] = res
-
-                # Check state
-                if issue_id in self.state:
-                    data = self.state[issue_id]
-                    last_sent = datetime.fromisoformat(data["last_sent"])
-                    # Ensure timezone-aware for comparison
-                    if last_sent.tzinfo is None:
-                        last_sent = last_sent.replace(tzinfo=timezone.utc)
-
-                    # Policy: Only resend if > 24h passed
-                    if now - last_sent > timedelta(hours=24):
-                        data["count"] += 1
-                        data["last_sent"] = now.isoformat()
-                        res["alert_count"] = data["count"]
-                        alerts_to_send.append(res)
-                        logger.info(f"Resending alert for {issue_id} (Count: {data['count']})")
-                    else:
-                        logger.info(f"Snoozing alert for {issue_id} (Sent {last_sent})")
-                else:
+        # Epoch seconds: stored and compared as plain numbers, no date parsing
+        now_ts = time.time()
+        # Policy: Only resend if > 24h passed
+        cutoff_ts = now_ts - RESEND_AFTER_SECONDS
+
+        current_ids = set()
+        # Alerts to send, grouped by domain as they are found (single pass)
+        domain_groups = defaultdict(list)
+
+        with self.db:  # one transaction per scan
+            # 1. Identify current issues
+            for res in results:
+                if res.get("status") not in ["critical", "error", "warning"]:
+                    continue
+                # Unique ID for an issue: Domain + Monitor Type
+                issue_id = f"{res['domain']}:{res['monitor']}"
+                current_ids.add(issue_id)
+
+                inserted = self.db.execute(
+                    "INSERT OR IGNORE INTO state VALUES (?, ?, ?, 1, ?, ?)",
+                    (issue_id, now_ts, now_ts, res["monitor"], res["domain"]),
+                ).rowcount
+                if inserted:
                     # New Issue
-                    self.state[issue_id] = {
-                        "first_seen": now.isoformat(),
-                        "last_sent": now.isoformat(),
-                        "count": 1,
-                        "monitor": res["monitor"],
-                        "domain": res["domain"],
-                    }
                     res["alert_count"] = 1
-                    alerts_to_send.append(res)
-
-        # 2. Cleanup Resolved Issues
-        ids_to_remove = []
-        for issue_id in self.state:
-            if issue_id not in current_issues:
+                    domain_groups[res["domain"]].append(res)
+                    continue
+
+                resent = self.db.execute(
+                    "UPDATE state SET count = count + 1, last_sent = ? "
+                    "WHERE issue_id = ? AND last_sent < ? RETURNING count",
+                    (now_ts, issue_id, cutoff_ts),
+                ).fetchone()
+                if resent:
+                    res["alert_count"] = resent[0]
+                    domain_groups[res["domain"]].append(res)
+                    logger.info(f"Resending alert for {issue_id} (Count: {resent[0]})")
+                else:
+                    logger.info(f"Snoozing alert for {issue_id}")
+
+            # 2. Cleanup Resolved Issues (a temp table avoids SQLite's bound-parameter limit)
+            self.db.execute("CREATE TEMP TABLE IF NOT EXISTS current_issues (issue_id TEXT PRIMARY KEY)")
+            self.db.execute("DELETE FROM current_issues")
+            self.db.executemany("INSERT INTO current_issues VALUES (?)", ((i,) for i in current_ids))
+            resolved = self.db.execute(
+                "DELETE FROM state WHERE issue_id NOT IN (SELECT issue_id FROM current_issues) "
+                "RETURNING issue_id"
+            ).fetchall()
+            for (issue_id,) in resolved:
                 logger.success(f"Issue resolved: {issue_id}")
-                ids_to_remove.append(issue_id)
-        
-        for i in ids_to_remove:
-            del self.state[i]
-
-        self._save_state()
 
-        # 3. Aggregate by Domain
-        if not alerts_to_send:
+        if not domain_groups:
             logger.info("No new alerts to send.")
             return
 
-        domain_groups = defaultdict(list)
-        for alert in alerts_to_send:
-            domain_groups[alert["domain"]].append(alert)
+        # 3. Send Aggregated Messages. Past the (opt-in) threshold, one scan-wide
+        # digest replaces the per-domain ones so an outage storm opens one issue, not N.
+        notify_cfg = self.config.get("notifications", {})
+        threshold = notify_cfg.get("digest_threshold")
+        if threshold and len(domain_groups) > threshold:
+            await self._send_scan_digest(domain_groups)
+            return
+
+        # One digest per domain, a bounded number at a time so a large batch
+        # cannot exhaust the service's HTTP connection pool
+        semaphore = asyncio.Semaphore(notify_cfg.get("max_concurrent_notifications", NOTIFY_MAX_CONCURRENT))
+
+        async def bounded(domain: str, alerts: list):
+            async with semaphore:
+                await self._send_aggregated_alert(domain, alerts)
 
-        # 4. Send Aggregated Messages
-        for domain, alerts in domain_groups.items():
-            await self._send_aggregated_alert(domain, alerts)
+        outcomes = await asyncio.gather(
+            *(bounded(domain, alerts) for domain, alerts in domain_groups.items()),
+            return_exceptions=True,
+        )
+        for domain, outcome in zip(domain_groups, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to send digest for {domain}: {outcome}")
 
     async def _send_aggregated_alert(self, domain: str, alerts: list):
         """Constructs a digest message for the domain."""
         title = f"Security Alert: {domain}"
-        lines = [f"Found {len(alerts)} issues for **{domain}**:"]
-
-        for alert in alerts:
-            tag = "[CRIT]" if alert.get("status") == "critical" else "[WARN]"
-            cnt = f"(Repeated {alert.get('alert_count')}x)" if alert.get("alert_count", 0) > 1 else "(New)"
-            lines.append(f"{tag} **{alert['monitor'].upper()}**: {alert.get('message', 'Unknown Error')} {cnt}")
-            if "details" in alert:
-                dets = alert["details"]
-                if isinstance(dets, list):
-                    for d in dets[:3]:
-                        lines.append(f"   - {d}")
-                elif isinstance(dets, str):
-                    lines.append(f"   - {dets}")
-
-        message = "\n".join(lines)
+        message = "\n".join([
+            f"Found {len(alerts)} issues for **{domain}**:",
+            *chain.from_iterable(map(_alert_lines, alerts)),
+        ])
         level = "critical" if any(a.get("status") == "critical" for a in alerts) else "warning"
         await self.service.send_notification(title, message, level)
+
+    async def _send_scan_digest(self, domain_groups: dict):
+        """Sends one digest covering every affected domain as a Markdown table."""
+        rows = [
+            f"| {domain} | {alert['monitor'].upper()} | {alert.get('status')} | {alert.get('message', 'Unknown Error')} |"
+            for domain, alerts in domain_groups.items()
+            for alert in alerts
+        ]
+        title = f"Scan digest: {len(domain_groups)} domains affected"
+        message = "\n".join([
+            f"Found {len(rows)} issues across {len(domain_groups)} domains:",
+            "",
+            "| Domain | Monitor | Status | Message |",
+            "|---|---|---|---|",
+            *rows,
+        ])
+        level = "critical" if any(
+            a.get("status") == "critical" for alerts in domain_groups.values() for a in alerts
+        ) else "warning"
+        await self.service.send_notification(title, message, level)
@@ -1,5 +1,10 @@
+import asyncio
+import hashlib
+import time
 import aiohttp
 import smtplib
+from collections import deque
+from dataclasses import dataclass
 from email.message import EmailMessage
 from datetime import datetime, timezone
 from typing import Optional
@@ -8,7 +13,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from github import Github
 import gitlab
 from loguru import logger
-from src.constants import TIMEOUT_HTTP
+from src.constants import TIMEOUT_HTTP, NOTIFY_HTTP_CONNECTIONS
 
 class NotificationSettings(BaseSettings):
     # GitHub
@@ -38,12 +43,27 @@ class NotificationSettings(BaseSettings):
     # Generic Webhook
     GENERIC_WEBHOOK_URL: Optional[str] = None
 
+    # Throttling: at most NOTIFY_MAX_PER_WINDOW sends per channel per window
+    NOTIFY_WINDOW_SECONDS: float = 60.0
+    NOTIFY_MAX_PER_WINDOW: int = 20
+    # Identical notifications within this many seconds are sent only once
+    NOTIFY_DEDUP_SECONDS: float = 300.0
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 settings = NotificationSettings()
 
 HTTP_TIMEOUT = aiohttp.ClientTimeout(total=TIMEOUT_HTTP)
 
+_TELEGRAM_URL = "https://api.telegram.org/bot{token}/sendMessage"
+
+# Static part of the Teams MessageCard; per-message fields are merged in per send
+_TEAMS_TEMPLATE = {
+    "@type": "MessageCard",
+    "@context": "http://schema.org/extensions",
+}
+_TEAMS_COLOR = {"critical": "FF0000"}.get
+
 # Allowed URL schemes for webhook / external URLs
 _ALLOWED_SCHEMES = {"https"}
 
@@ -66,6 +86,74 @@ def _validate_webhook_url(url: str) -> str:
     return url
 
 
+class SlidingWindowLimiter:
+    """
+    Allow at most ``max_per_window`` events in any ``window`` seconds.
+    ``acquire()`` waits for a free slot instead of failing, so bursts are
+    spread out rather than tripping provider rate limits (HTTP 429).
+    Meant for a single event loop: no await happens between check and claim.
+    """
+
+    def __init__(self, max_per_window: int, window: float):
+        self.max_per_window = max_per_window
+        self.window = window
+        self._sent: deque = deque()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            while self._sent and self._sent[0] <= now - self.window:
+                self._sent.popleft()
+            if len(self._sent) < self.max_per_window:
+                self._sent.append(now)
+                return
+            await asyncio.sleep(self._sent[0] + self.window - now)
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedChannels:
+    """
+    Channel credentials resolved once per service (env vars > config YAML).
+    ``None`` means the channel is not configured; webhook URLs are pre-validated.
+    """
+    github_token: Optional[str] = None
+    github_repo: Optional[str] = None
+    gitlab_url: Optional[str] = None
+    gitlab_token: Optional[str] = None
+    gitlab_project_id: Optional[str] = None
+    telegram_token: Optional[str] = None
+    telegram_chat_id: Optional[str] = None
+    teams_url: Optional[str] = None
+    email_server: Optional[str] = None
+    email_to: Optional[str] = None
+    webhook_url: Optional[str] = None
+
+    def enabled(self) -> tuple:
+        """Names of the channels that have everything they need to send."""
+        return tuple(name for name, ready in (
+            ("github", self.github_token and self.github_repo),
+            ("gitlab", self.gitlab_token and self.gitlab_project_id),
+            ("telegram", self.telegram_token and self.telegram_chat_id),
+            ("teams", self.teams_url),
+            ("email", self.email_server and self.email_to),
+            ("webhook", self.webhook_url),
+        ) if ready)
+
+
+# Channel name -> sender method; every sender takes (title, message, level)
+# and returns True once delivered, False if the provider call failed
+_SENDERS = {
+    "github": "_send_github_issue",
+    "gitlab": "_send_gitlab_issue",
+    "telegram": "_send_telegram",
+    "teams": "_send_teams",
+    "email": "_send_email",
+    "webhook": "_send_webhook",
+}
+# Issue trackers only receive critical notifications
+_CRITICAL_ONLY = frozenset({"github", "gitlab"})
+
+
 class NotificationService:
     def __init__(self, config: dict = None):
         """
@@ -73,95 +161,209 @@ class NotificationService:
         Priority: Env Vars (settings) > Config YAML > None
         """
         self.config = config or {}
-        
+        # Shared HTTP session (lazily created, see _ensure_session)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+        # One limiter per channel: a storm on one provider doesn't delay the others
+        self._limiters = {
+            channel: SlidingWindowLimiter(settings.NOTIFY_MAX_PER_WINDOW, settings.NOTIFY_WINDOW_SECONDS)
+            for channel in _SENDERS
+        }
+        # GitHub / GitLab clients, built on first use and reused (see _github_repo)
+        self._github_repos: dict = {}
+        self._gitlab_projects: dict = {}
+        # Digest of recently sent notifications -> monotonic send time
+        self._recent_digests: dict[bytes, float] = {}
+        # Credentials are looked up once; unconfigured channels are never scheduled
+        self._cfg = self._resolve_channels()
+        self._enabled = self._cfg.enabled()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared ClientSession, creating it on first use.
+        Keeping one pooled session means webhook posts reuse open TCP+TLS
+        connections. A session is bound to its event loop, so a new one is
+        made if the old one was closed or belongs to another loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            # Close a session left over from a previous loop so its connector
+            # is released instead of leaking ("Unclosed client session")
+            await self.close()
+            self._session = aiohttp.ClientSession(
+                timeout=HTTP_TIMEOUT,
+                connector=aiohttp.TCPConnector(limit=NOTIFY_HTTP_CONNECTIONS, ttl_dns_cache=300, keepalive_timeout=75),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session (safe to call more than once)."""
+        if self._session is not None and not self._session.closed:
+            try:
+                await self._session.close()
+            except Exception as e:
+                # A session from a loop that is already closed may fail to shut down cleanly
+                logger.debug(f"Error closing notification HTTP session: {e}")
+        self._session = None
+        self._session_loop = None
+
     def _get_config_value(self, channel: str, key: str, env_value: Optional[str] = None) -> Optional[str]:
         """
         Retrieve a config value, preferring env var over YAML config.
         """
         return env_value or self.config.get("notifications", {}).get(channel, {}).get(key)
 
-    async def send_notification(self, title: str, message: str, level: str = "info"):
+    def _resolve_channels(self) -> ResolvedChannels:
+        def webhook(channel: str, key: str, env_value: Optional[str], label: str) -> Optional[str]:
+            raw_url = self._get_config_value(channel, key, env_value)
+            if not raw_url:
+                return None
+            try:
+                return _validate_webhook_url(raw_url)
+            except ValueError as e:
+                logger.error(f"{label} URL rejected: {e}")
+                return None
+
+        return ResolvedChannels(
+            github_token=self._get_config_value("github", "token", settings.GITHUB_TOKEN),
+            github_repo=self._get_config_value("github", "repo", settings.GITHUB_REPO),
+            gitlab_url=settings.GITLAB_URL,
+            gitlab_token=self._get_config_value("gitlab", "token", settings.GITLAB_TOKEN),
+            gitlab_project_id=self._get_config_value("gitlab", "project_id", settings.GITLAB_PROJECT_ID),
+            telegram_token=self._get_config_value("telegram", "bot_token", settings.TELEGRAM_BOT_TOKEN),
+            telegram_chat_id=self._get_config_value("telegram", "chat_id", settings.TELEGRAM_CHAT_ID),
+            teams_url=webhook("teams", "webhook_url", settings.TEAMS_WEBHOOK_URL, "Teams webhook"),
+            email_server=settings.EMAIL_SMTP_SERVER,
+            email_to=settings.EMAIL_TO,
+            webhook_url=webhook("webhook", "url", settings.GENERIC_WEBHOOK_URL, "Generic webhook"),
+        )
+
+    async def send_notification(self, title: str, message: str, level: str = "info", dedup: bool = True) -> list:
         """
         Send notification to all configured channels.
+        With ``dedup``, a notification already delivered within NOTIFY_DEDUP_SECONDS is skipped.
+        Returns the names of the channels that delivered it (empty if none did).
         """
+        digest = self._digest(title, message, level)
+        if dedup:
+            if self._is_duplicate(digest):
+                logger.info(f"Skipping duplicate notification: {title} [{level}]")
+                return []
+            # Reserve the digest before the first await, so an identical
+            # notification sent concurrently is skipped instead of racing this one
+            self._recent_digests[digest] = time.monotonic()
+
         logger.info(f"Sending notification: {title} [{level}]")
-        
-        await self._send_github_issue(title, message, level)
-        await self._send_gitlab_issue(title, message, level)
-        await self._send_telegram(title, message)
-        await self._send_teams(title, message, level)
-        await self._send_email(title, message)
-        await self._send_webhook(title, message, level)
+
+        # Channels are independent: send concurrently so latency is the slowest
+        # channel, not the sum. Only channels that will actually send are scheduled.
+        channels = [
+            name for name in self._enabled
+            if level == "critical" or name not in _CRITICAL_ONLY
+        ]
+        coros = [getattr(self, _SENDERS[name])(title, message, level) for name in channels]
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for channel, result in zip(channels, results):
+            if isinstance(result, Exception):
+                logger.error(f"{channel} notification failed: {result}")
+        delivered = [channel for channel, result in zip(channels, results) if result is True]
+        # Only a delivered notification suppresses repeats: if every channel
+        # failed, release the reservation so the next attempt goes out again
+        if delivered:
+            self._recent_digests[digest] = time.monotonic()
+        elif dedup:
+            self._recent_digests.pop(digest, None)
+        return delivered
+
+    @staticmethod
+    def _digest(title: str, message: str, level: str) -> bytes:
+        return hashlib.blake2b(f"{level}\0{title}\0{message}".encode(), digest_size=16).digest()
+
+    def _is_duplicate(self, digest: bytes) -> bool:
+        """True if a notification with this digest is in flight or was delivered within NOTIFY_DEDUP_SECONDS."""
+        now = time.monotonic()
+        window = settings.NOTIFY_DEDUP_SECONDS
+        self._recent_digests = {h: ts for h, ts in self._recent_digests.items() if now - ts < window}
+        return digest in self._recent_digests
+
+    def _github_repo(self, token: str, repo_name: str):
+        """Cached PyGithub repo handle: one client (and connection pool) per token/repo."""
+        key = (token, repo_name)
+        if key not in self._github_repos:
+            self._github_repos[key] = Github(token).get_repo(repo_name)
+        return self._github_repos[key]
+
+    def _gitlab_project(self, url: str, token: str, pid: str):
+        """Cached python-gitlab project handle, as for ``_github_repo``."""
+        key = (url, token, pid)
+        if key not in self._gitlab_projects:
+            self._gitlab_projects[key] = gitlab.Gitlab(url, private_token=token).projects.get(pid)
+        return self._gitlab_projects[key]
+
+    def _create_github_issue(self, title: str, body: str, level: str):
+        repo = self._github_repo(self._cfg.github_token, self._cfg.github_repo)
+        repo.create_issue(title=f"[{level.upper()}] {title}", body=body, labels=[level])
+
+    def _create_gitlab_issue(self, title: str, body: str, level: str):
+        project = self._gitlab_project(self._cfg.gitlab_url, self._cfg.gitlab_token, self._cfg.gitlab_project_id)
+        project.issues.create({'title': f"[{level.upper()}] {title}", 'description': body})
 
     async def _send_github_issue(self, title: str, body: str, level: str):
-        token = self._get_config_value("github", "token", settings.GITHUB_TOKEN)
-        repo_name = self._get_config_value("github", "repo", settings.GITHUB_REPO)
-        
-        if not (token and repo_name and level == "critical"):
-            return
-            
+        await self._limiters["github"].acquire()
+
         try:
-            g = Github(token)
-            repo = g.get_repo(repo_name)
-            repo.create_issue(title=f"[{level.upper()}] {title}", body=body, labels=[level])
+            # PyGithub is blocking: keep it off the event loop so other channels proceed
+            await asyncio.to_thread(self._create_github_issue, title, body, level)
             logger.info("GitHub Issue created.")
+            return True
         except Exception as e:
             logger.error(f"GitHub notification failed: {e}")
+            return False
 
     async def _send_gitlab_issue(self, title: str, body: str, level: str):
-        token = self._get_config_value("gitlab", "token", settings.GITLAB_TOKEN)
-        pid = self._get_config_value("gitlab", "project_id", settings.GITLAB_PROJECT_ID)
-        
-        if not (token and pid and level == "critical"):
-            return
-            
+        await self._limiters["gitlab"].acquire()
+
         try:
-            gl = gitlab.Gitlab(settings.GITLAB_URL, private_token=token)
-            project = gl.projects.get(pid)
-            project.issues.create({'title': f"[{level.upper()}] {title}", 'description': body})
+            await asyncio.to_thread(self._create_gitlab_issue, title, body, level)
             logger.info("GitLab Issue created.")
+            return True
         except Exception as e:
             logger.error(f"GitLab notification failed: {e}")
+            return False
+
+    async def _send_telegram(self, title: str, message: str, level: str = "info"):
+        await self._limiters["telegram"].acquire()
 
-    async def _send_telegram(self, title: str, message: str):
-        token = self._get_config_value("telegram", "bot_token", settings.TELEGRAM_BOT_TOKEN)
-        chat_id = self._get_config_value("telegram", "chat_id", settings.TELEGRAM_CHAT_ID)
-        
-        if not (token and chat_id):
-            return
-            
         try:
-            url = f"https://api.telegram.org/bot{token}/sendMessage"
+            url = _TELEGRAM_URL.format(token=self._cfg.telegram_token)
             payload = {
-                "chat_id": chat_id,
+                "chat_id": self._cfg.telegram_chat_id,
                 "text": f"*{title}*\n\n{message}",
                 "parse_mode": "Markdown"
             }
-            async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
-                async with session.post(url, json=payload) as resp:
-                    resp.raise_for_status()
+            session = await self._ensure_session()
+            async with session.post(url, json=payload) as resp:
+                resp.raise_for_status()
             logger.info("Telegram message sent.")
+            return True
         except Exception as e:
             logger.error(f"Telegram notification failed: {e}")
+            return False
 
     async def _send_teams(self, title: str, message: str, level: str):
-        raw_url = self._get_config_value("teams", "webhook_url", settings.TEAMS_WEBHOOK_URL)
-
-        if not raw_url:
-            return
+        await self._limiters["teams"].acquire()
 
         try:
-            url = _validate_webhook_url(raw_url)
-        except ValueError as e:
-            logger.error(f"Teams webhook URL rejected: {e}")
-            return
-
-        try:
-            color = "FF0000" if level == "critical" else "00FF00"
             payload = {
-                "@type": "MessageCard",
-                "@context": "http://schema.org/extensions",
-                "themeColor": color,
+                **_TEAMS_TEMPLATE,
+                "themeColor": _TEAMS_COLOR(level, "00FF00"),
                 "summary": title,
                 "sections": [{
                     "activityTitle": title,
@@ -169,47 +371,42 @@ class NotificationService:
                     "text": message
                 }]
             }
-            async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
-                async with session.post(url, json=payload) as resp:
-                    resp.raise_for_status()
+            session = await self._ensure_session()
+            async with session.post(self._cfg.teams_url, json=payload) as resp:
+                resp.raise_for_status()
             logger.info("Teams webhook sent.")
+            return True
         except Exception as e:
             logger.error(f"Teams notification failed: {e}")
+            return False
+
+    def _send_email_sync(self, title: str, body: str):
+        msg = EmailMessage()
+        msg.set_content(body)
+        msg['Subject'] = title
+        msg['From'] = settings.EMAIL_FROM or "monitor@domainmate.local"
+        msg['To'] = self._cfg.email_to
+
+        with smtplib.SMTP(self._cfg.email_server, settings.EMAIL_SMTP_PORT, timeout=TIMEOUT_HTTP) as server:
+            if settings.EMAIL_USER and settings.EMAIL_PASSWORD:
+                server.starttls()
+                server.login(settings.EMAIL_USER, settings.EMAIL_PASSWORD)
+            server.send_message(msg)
+
+    async def _send_email(self, title: str, body: str, level: str = "info"):
+        await self._limiters["email"].acquire()
 
-    async def _send_email(self, title: str, body: str):
-        srv = settings.EMAIL_SMTP_SERVER
-        to = settings.EMAIL_TO
-        
-        if not (srv and to):
-            return
-            
         try:
-            msg = EmailMessage()
-            msg.set_content(body)
-            msg['Subject'] = title
-            msg['From'] = settings.EMAIL_FROM or "monitor@domainmate.local"
-            msg['To'] = to
-
-            with smtplib.SMTP(settings.EMAIL_SMTP_SERVER, settings.EMAIL_SMTP_PORT) as server:
-                if settings.EMAIL_USER and settings.EMAIL_PASSWORD:
-                    server.starttls()
-                    server.login(settings.EMAIL_USER, settings.EMAIL_PASSWORD)
-                server.send_message(msg)
+            # smtplib is blocking: run the SMTP conversation off the event loop
+            await asyncio.to_thread(self._send_email_sync, title, body)
             logger.info("Email sent.")
+            return True
         except Exception as e:
             logger.error(f"Email notification failed: {e}")
+            return False
 
     async def _send_webhook(self, title: str, message: str, level: str):
-        raw_url = self._get_config_value("webhook", "url", settings.GENERIC_WEBHOOK_URL)
-
-        if not raw_url:
-            return
-
-        try:
-            url = _validate_webhook_url(raw_url)
-        except ValueError as e:
-            logger.error(f"Generic webhook URL rejected: {e}")
-            return
+        await self._limiters["webhook"].acquire()
 
         try:
             payload = {
@@ -218,15 +415,16 @@ class NotificationService:
                 "level": level,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
-            async with aiohttp.ClientSession(timeout=HTTP_TIMEOUT) as session:
-                async with session.post(url, json=payload) as resp:
-                    resp.raise_for_status()
+            session = await self._ensure_session()
+            async with session.post(self._cfg.webhook_url, json=payload) as resp:
+                resp.raise_for_status()
             logger.info("Generic Webhook sent.")
+            return True
         except Exception as e:
             logger.error(f"Generic Webhook failed: {e}")
+            return False
 
 if __name__ == "__main__":
     # Test
-    import asyncio
     s = NotificationService()
     asyncio.run(s.send_notification("Test Alert", "This is a test from DomainMate.", "info"))
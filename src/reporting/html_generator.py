@@ -1,185 +1,21 @@
+import contextlib
+import gzip
 import os
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from functools import lru_cache
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 from datetime import datetime, timezone
-import json
+import orjson
 
-class HTMLGenerator:
-    def __init__(self, template_dir: str = "src/templates", output_dir: str = "reports"):
-        self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
-        os.makedirs(template_dir, exist_ok=True)
-        self.env = Environment(
-            loader=FileSystemLoader(template_dir),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
-        self._create_default_template(os.path.join(template_dir, "report.html"))
-
-    def _create_default_template(self, path: str):
-        with open(path, "w") as f:
-            f.write("""<!DOCTYPE html>
+_DEFAULT_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>DomainMate Security Audit</title>
     <link rel="icon" href='data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" stroke="%231d4ed8" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M9 12l2 2 4-4m5.618-4.016A11.955 11.955 0 0112 2.944a11.955 11.955 0 01-8.618 3.04A12.02 12.02 0 003 9c0 5.591 3.824 10.29 9 11.622 5.176-1.332 9-6.03 9-11.622 0-1.042-.133-2.052-.382-3.016z"/></svg>'>
-    <!-- Fonts -->
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    <!-- DataTables CSS -->
-    <link rel="stylesheet" href="https://cdn.datatables.net/1.13.6/css/dataTables.bootstrap5.min.css">
-    <link rel="stylesheet" href="https://cdn.datatables.net/rowgroup/1.4.1/css/rowGroup.bootstrap5.min.css">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/twitter-bootstrap/5.3.0/css/bootstrap.min.css">
-    
-    <style>
-        :root {
-            --primary-bg: #f8f9fa;
-            --card-bg: #ffffff;
-            --text-main: #1f2937;
-            --text-secondary: #6b7280;
-            --border-color: #e5e7eb;
-            --success-bg: #ecfdf5; --success-text: #047857;
-            --warning-bg: #fffbeb; --warning-text: #b45309;
-            --danger-bg: #fef2f2; --danger-text: #b91c1c;
-            --info-bg: #eff6ff; --info-text: #1d4ed8;
-        }
-        
-        body {
-            font-family: 'Inter', sans-serif;
-            background-color: var(--primary-bg);
-            color: var(--text-main);
-            font-size: 0.875rem;
-            padding-bottom: 40px;
-        }
-
-        .navbar {
-            background-color: var(--card-bg);
-            border-bottom: 1px solid var(--border-color);
-            padding: 1rem 2rem;
-            margin-bottom: 2rem;
-            box-shadow: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
-        }
-
-        .navbar-brand {
-            font-weight: 700;
-            color: var(--text-main);
-            letter-spacing: -0.025em;
-            display: flex;
-            align-items: center;
-            gap: 0.75rem;
-        }
-
-        .kpi-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(240px, 1fr));
-            gap: 1.5rem;
-            margin-bottom: 2rem;
-        }
-
-        .kpi-card {
-            background: var(--card-bg);
-            padding: 1.5rem;
-            border: 1px solid var(--border-color);
-            border-radius: 8px;
-            box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1);
-        }
-
-        .kpi-label {
-            color: var(--text-secondary);
-            font-size: 0.75rem;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-            font-weight: 600;
-            margin-bottom: 0.5rem;
-        }
-
-        .kpi-value {
-            font-size: 2.25rem;
-            font-weight: 700;
-            line-height: 1;
-        }
-
-        .main-card {
-            background: var(--card-bg);
-            border: 1px solid var(--border-color);
-            border-radius: 8px;
-            box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1);
-            padding: 1.5rem;
-        }
-
-        .badge-ent {
-            padding: 0.25em 0.6em;
-            font-size: 0.75em;
-            font-weight: 600;
-            border-radius: 4px;
-            text-transform: uppercase;
-        }
-        .badge-ok { background-color: var(--success-bg); color: var(--success-text); border: 1px solid rgba(4, 120, 87, 0.1); }
-        .badge-warning { background-color: var(--warning-bg); color: var(--warning-text); border: 1px solid rgba(180, 83, 9, 0.1); }
-        .badge-critical { background-color: var(--danger-bg); color: var(--danger-text); border: 1px solid rgba(185, 28, 28, 0.1); }
-        .badge-error { background-color: var(--danger-bg); color: var(--danger-text); border: 1px solid rgba(185, 28, 28, 0.1); }
-
-        table.dataTable thead th {
-            font-weight: 600;
-            color: var(--text-secondary);
-            background-color: #f9fafb;
-            border-bottom: 2px solid var(--border-color);
-        }
-        
-        table.dataTable tbody td {
-            vertical-align: middle;
-            color: var(--text-main);
-        }
-
-        .progress {
-            height: 6px;
-            background-color: var(--border-color);
-            border-radius: 3px;
-            overflow: hidden;
-            margin-top: 6px;
-        }
-        .progress-bar { height: 100%; }
-        
-        .technical-details {
-            font-family: 'SFMono-Regular', Consolas, 'Liberation Mono', Menlo, monospace;
-            font-size: 0.75em;
-            color: var(--text-secondary);
-            background: #f3f4f6;
-            padding: 2px 6px;
-            border-radius: 4px;
-            display: inline-block;
-            max-width: 300px;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            white-space: nowrap;
-        }
-
-        /* SVG Icons classes */
-        .icon { width: 20px; height: 20px; vertical-align: bottom; }
-        .icon-sm { width: 16px; height: 16px; margin-right: 4px; vertical-align: text-bottom; }
-
-        .report-footer {
-            max-width: 1400px;
-            margin: 3rem auto 0;
-            padding: 1.25rem 2rem 0;
-            border-top: 1px solid var(--border-color);
-            text-align: center;
-            font-size: 0.8rem;
-            color: var(--text-secondary);
-        }
-        .report-footer a {
-            color: var(--text-secondary);
-            text-decoration: none;
-            display: inline-flex;
-            align-items: center;
-            gap: 0.4rem;
-            transition: color 0.15s ease;
-        }
-        .report-footer a:hover { color: var(--text-main); }
-        .report-footer .sep { margin: 0 0.6rem; opacity: 0.5; }
-
-    </style>
+    <link rel="stylesheet" href="report.css">
 </head>
-<body>
+<body data-generated-at="{{ timestamp_iso }}">
 
     <nav class="navbar">
         <div class="container-fluid max-w-7xl mx-auto">
@@ -196,14 +32,11 @@ class HTMLGenerator:
     <div class="container-fluid px-4" style="max-width: 1400px; margin: 0 auto;">
         
         <!-- KPI Summary -->
-        {% set compliance_color = 'var(--success-text)' %}
-        {% if stats.critical > 0 %}{% set compliance_color = 'var(--danger-text)' %}
-        {% elif stats.warning > 0 %}{% set compliance_color = 'var(--warning-text)' %}{% endif %}
         <div class="kpi-grid">
             <div class="kpi-card" style="border-left: 4px solid {{ compliance_color }};">
                 <div class="kpi-label">Compliance Status</div>
                 <div class="kpi-value" style="color: {{ compliance_color }};">
-                    {% if results|length == 0 or (stats.critical == 0 and stats.warning == 0) %}100%{% else %}{{ ((results|length - stats.critical - stats.warning) / results|length * 100)|round|int }}%{% endif %}
+                    {{ compliance }}%
                 </div>
                 <div class="text-secondary mt-1" style="font-size: 0.8em;">Operational Health</div>
             </div>
@@ -287,17 +120,20 @@ class HTMLGenerator:
         <div class="main-card">
             <div class="d-flex justify-content-between align-items-center mb-4">
                 <h5 class="m-0 font-weight-bold">Detailed Security Ledger</h5>
-                <div class="btn-group" role="group" id="statusFilter">
-                    <button type="button" class="btn btn-sm btn-outline-secondary active" data-filter="">All</button>
-                    <button type="button" class="btn btn-sm btn-outline-secondary" data-filter="WARNING|CRITICAL|ERROR">Issues</button>
-                    <button type="button" class="btn btn-sm btn-outline-secondary" data-filter="CRITICAL|ERROR">Critical</button>
+                <div class="d-flex align-items-center">
+                    <input type="search" id="tableSearch" class="table-search" placeholder="Filter Records..." aria-label="Filter Records">
+                    <div class="btn-group" role="group" id="statusFilter">
+                        <button type="button" class="btn btn-sm btn-outline-secondary active" data-filter="">All</button>
+                        <button type="button" class="btn btn-sm btn-outline-secondary" data-filter="WARNING|CRITICAL|ERROR">Issues</button>
+                        <button type="button" class="btn btn-sm btn-outline-secondary" data-filter="CRITICAL|ERROR">Critical</button>
+                    </div>
                 </div>
             </div>
 
             <table id="auditTable" class="table table-hover" style="width:100%">
                 <thead>
                     <tr>
-                        <th width="20%">Asset / Domain</th>
+                        <th class="col-domain">Asset / Domain</th>
                         <th width="10%">Monitor Type</th>
                         <th width="10%">Status</th>
                         <th width="35%">Audit Result</th>
@@ -305,9 +141,9 @@ class HTMLGenerator:
                     </tr>
                 </thead>
                 <tbody>
-                    {% for result in results %}
+                    {% for result in rows %}
                     <tr>
-                        <td class="font-weight-600">{{ result.domain }}</td>
+                        <td class="col-domain">{{ result.domain }}</td>
                         <td>
                             <span style="font-family: 'SFMono-Regular', monospace; font-size: 0.85em; color: var(--text-secondary); text-transform: uppercase;">{{ result.monitor }}</span>
                         </td>
@@ -320,14 +156,7 @@ class HTMLGenerator:
                              <div style="font-weight: 500;">{{ result.message or "Check Passed" }}</div>
                         </td>
                         <td>
-                             {% if result.days_until_expiry is defined %}
-                                {% set pct = (result.days_until_expiry / 365) * 100 %}
-                                {% if pct > 100 %}{% set pct = 100 %}{% endif %}
-                                {% if pct < 0 %}{% set pct = 0 %}{% endif %}
-                                {% set bar_color = '#10b981' %}
-                                {% if result.days_until_expiry < 30 %}{% set bar_color = '#f59e0b' %}{% endif %}
-                                {% if result.days_until_expiry < 7 %}{% set bar_color = '#ef4444' %}{% endif %}
-
+                             {% if result.expiry_pct is defined %}
                                 <div class="d-flex align-items-center justify-content-between">
                                     {% if result.days_until_expiry < 0 %}
                                     <span class="font-weight-bold" style="font-size: 0.85em; color: var(--danger-text);">Expired {{ -result.days_until_expiry }} days ago</span>
@@ -337,7 +166,7 @@ class HTMLGenerator:
                                     <span class="text-muted" style="font-size: 0.75em;">{{ result.expiration_date }}</span>
                                 </div>
                                 <div class="progress">
-                                    <div class="progress-bar" style="width: {{ pct }}%; background-color: {{ bar_color }};"></div>
+                                    <div class="progress-bar" style="width: {{ result.expiry_pct }}%; background-color: {{ result.bar_color }};"></div>
                                 </div>
                             {% elif result.monitor == 'blacklist' %}
                                 {% if result.listed_in %}
@@ -346,8 +175,8 @@ class HTMLGenerator:
                                     <span class="text-muted" style="font-size: 0.8em;">Clean IP Reputation</span>
                                 {% endif %}
                             {% else %}
-                                {% if result.details %}
-                                    <span class="technical-details" title="{{ result.details | tojson }}">{{ result.details | tojson | truncate(60) }}</span>
+                                {% if result.details_json %}
+                                    <span class="technical-details" title="{{ result.details_json }}">{{ result.details_short }}</span>
                                 {% else %}
                                     <span class="text-muted">–</span>
                                 {% endif %}
@@ -369,100 +198,485 @@ class HTMLGenerator:
         <span>MIT License</span>
     </footer>
 
-    <!-- Scripts -->
-    <script src="https://code.jquery.com/jquery-3.7.0.min.js"></script>
-    <script src="https://cdn.datatables.net/1.13.6/js/jquery.dataTables.min.js"></script>
-    <script src="https://cdn.datatables.net/1.13.6/js/dataTables.bootstrap5.min.js"></script>
-    <script src="https://cdn.datatables.net/rowgroup/1.4.1/js/dataTables.rowGroup.min.js"></script>
-    
-    <script>
-        $(document).ready(function() {
-            var table = $('#auditTable').DataTable({
-                "order": [[ 0, "asc" ]], // Order by Domain first for grouping
-                "pageLength": 50, // Show more rows per page since we group
-                "rowGroup": {
-                    "dataSrc": 0,
-                    "startRender": function ( rows, group ) {
-                        return $('<tr/>')
-                            .append( '<td colspan="5" style="background-color: #e5e7eb; font-weight: 700; color: #374151; padding-top: 12px; padding-bottom: 12px;">' + group + ' <span class="badge bg-secondary rounded-pill ms-2" style="font-size: 0.7em;">' + rows.count() + ' Checks</span></td>' );
-                    }
-                },
-                "columnDefs": [
-                    { "visible": false, "targets": 0 } // Hide the first column (Domain) since it's in the header
-                ],
-                "language": {
-                    "search": "Filter Records:",
-                    "lengthMenu": "Show _MENU_ entries",
-                },
-                "dom": '<"d-flex justify-content-between mb-3"lf>rt<"d-flex justify-content-between mt-3"ip>'
-            });
-
-            // Status filter (matches rendered text of the Status column)
-            $('#statusFilter button').on('click', function() {
-                $('#statusFilter button').removeClass('active');
-                $(this).addClass('active');
-                table.column(2).search(this.dataset.filter, true, false).draw();
-            });
-
-            // Data Freshness Check
-            const generatedAt = new Date("{{ timestamp_iso }}");
-            const now = new Date();
-            const diffHours = (now - generatedAt) / (1000 * 60 * 60);
-
-            if (diffHours > 25) {
-                const banner = `
-                <div class="alert alert-danger d-flex align-items-center mb-4" role="alert">
-                    <svg class="icon icon-lg me-2" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 8v4m0 4h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z"></path></svg>
-                    <div>
-                        <strong>DATA STALE WARNING:</strong> This report was generated more than 24 hours ago (${Math.round(diffHours)}h). The automated scan may have failed.
-                    </div>
-                </div>`;
-                $('.container-fluid.px-4').prepend(banner);
-            }
-        });
-    </script>
+    <script src="report.js" defer></script>
 </body>
 </html>
-""")
+"""
+
+# Static report assets, written next to index.html so browsers cache them across reports
+_REPORT_CSS = """:root {
+    --primary-bg: #f8f9fa;
+    --card-bg: #ffffff;
+    --text-main: #1f2937;
+    --text-secondary: #6b7280;
+    --border-color: #e5e7eb;
+    --success-bg: #ecfdf5; --success-text: #047857;
+    --warning-bg: #fffbeb; --warning-text: #b45309;
+    --danger-bg: #fef2f2; --danger-text: #b91c1c;
+    --info-bg: #eff6ff; --info-text: #1d4ed8;
+}
+
+*, *::before, *::after { box-sizing: border-box; }
+
+body {
+    font-family: Inter, -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+    background-color: var(--primary-bg);
+    color: var(--text-main);
+    font-size: 0.875rem;
+    line-height: 1.5;
+    margin: 0;
+    padding-bottom: 40px;
+}
+
+h5, h6 { margin-top: 0; font-weight: 500; line-height: 1.2; }
+h5 { font-size: 1.25rem; }
+h6 { font-size: 1rem; }
+
+/* Layout utilities (the subset of Bootstrap this report uses) */
+.container-fluid { width: 100%; }
+.d-flex { display: flex; }
+.align-items-center { align-items: center; }
+.justify-content-between { justify-content: space-between; }
+.m-0 { margin: 0; }
+.mt-1 { margin-top: 0.25rem; }
+.mb-1 { margin-bottom: 0.25rem; }
+.mb-3 { margin-bottom: 1rem; }
+.mb-4 { margin-bottom: 1.5rem; }
+.ms-2 { margin-left: 0.5rem; }
+.me-2 { margin-right: 0.5rem; }
+.mx-auto { margin-left: auto; margin-right: auto; }
+.p-3 { padding: 1rem; }
+.px-4 { padding-left: 1.5rem; padding-right: 1.5rem; }
+.font-weight-bold { font-weight: 700; }
+.font-weight-600 { font-weight: 600; }
+.text-uppercase { text-transform: uppercase; }
+.text-secondary, .text-muted { color: var(--text-secondary); }
+.text-dark { color: var(--text-main); }
+
+.badge {
+    display: inline-block;
+    padding: 0.35em 0.65em;
+    font-size: 0.75em;
+    font-weight: 700;
+    line-height: 1;
+    color: #fff;
+}
+.bg-secondary { background-color: #6b7280; }
+.rounded-pill { border-radius: 50rem; }
+
+.alert {
+    padding: 1rem;
+    border: 1px solid #fecaca;
+    border-radius: 6px;
+}
+.alert-danger { color: var(--danger-text); background-color: var(--danger-bg); }
+
+.btn-group { display: inline-flex; }
+.btn {
+    font: inherit;
+    cursor: pointer;
+    background: transparent;
+    border: 1px solid #6b7280;
+    color: #6b7280;
+    padding: 0.25rem 0.5rem;
+    font-size: 0.8rem;
+}
+.btn-group .btn + .btn { margin-left: -1px; }
+.btn-group .btn:first-child { border-radius: 4px 0 0 4px; }
+.btn-group .btn:last-child { border-radius: 0 4px 4px 0; }
+.btn:hover, .btn.active { background-color: #6b7280; color: #fff; }
+
+.table-search {
+    font: inherit;
+    padding: 0.25rem 0.5rem;
+    border: 1px solid var(--border-color);
+    border-radius: 4px;
+    margin-right: 0.75rem;
+}
+
+.navbar {
+    background-color: var(--card-bg);
+    border-bottom: 1px solid var(--border-color);
+    padding: 1rem 2rem;
+    margin-bottom: 2rem;
+    box-shadow: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
+}
+
+.navbar > .container-fluid {
+    display: flex;
+    align-items: center;
+    justify-content: space-between;
+}
+
+.navbar-brand {
+    font-weight: 700;
+    color: var(--text-main);
+    letter-spacing: -0.025em;
+    display: flex;
+    align-items: center;
+    gap: 0.75rem;
+}
+
+.kpi-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(240px, 1fr));
+    gap: 1.5rem;
+    margin-bottom: 2rem;
+}
+
+.kpi-card {
+    background: var(--card-bg);
+    padding: 1.5rem;
+    border: 1px solid var(--border-color);
+    border-radius: 8px;
+    box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1);
+}
+
+.kpi-label {
+    color: var(--text-secondary);
+    font-size: 0.75rem;
+    text-transform: uppercase;
+    letter-spacing: 0.05em;
+    font-weight: 600;
+    margin-bottom: 0.5rem;
+}
+
+.kpi-value {
+    font-size: 2.25rem;
+    font-weight: 700;
+    line-height: 1;
+}
+
+.main-card {
+    background: var(--card-bg);
+    border: 1px solid var(--border-color);
+    border-radius: 8px;
+    box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1);
+    padding: 1.5rem;
+}
+
+.badge-ent {
+    padding: 0.25em 0.6em;
+    font-size: 0.75em;
+    font-weight: 600;
+    border-radius: 4px;
+    text-transform: uppercase;
+}
+.badge-ok { background-color: var(--success-bg); color: var(--success-text); border: 1px solid rgba(4, 120, 87, 0.1); }
+.badge-warning { background-color: var(--warning-bg); color: var(--warning-text); border: 1px solid rgba(180, 83, 9, 0.1); }
+.badge-critical { background-color: var(--danger-bg); color: var(--danger-text); border: 1px solid rgba(185, 28, 28, 0.1); }
+.badge-error { background-color: var(--danger-bg); color: var(--danger-text); border: 1px solid rgba(185, 28, 28, 0.1); }
+
+.table { width: 100%; border-collapse: collapse; }
+.table th, .table td {
+    padding: 0.5rem;
+    text-align: left;
+    border-bottom: 1px solid var(--border-color);
+}
+.table thead th {
+    font-weight: 600;
+    color: var(--text-secondary);
+    background-color: #f9fafb;
+    border-bottom: 2px solid var(--border-color);
+    cursor: pointer;
+    user-select: none;
+}
+.table thead th[data-sort="1"]::after { content: " \\25B2"; }
+.table thead th[data-sort="-1"]::after { content: " \\25BC"; }
+
+.table tbody td {
+    vertical-align: middle;
+    color: var(--text-main);
+}
+.table-hover tbody tr:not(.group-row):hover { background-color: #f9fafb; }
+.table .group-row td {
+    background-color: #e5e7eb;
+    font-weight: 700;
+    color: #374151;
+    padding-top: 12px;
+    padding-bottom: 12px;
+}
+/* Domain is shown in the group header row instead */
+.table .col-domain { display: none; }
+
+.progress {
+    height: 6px;
+    background-color: var(--border-color);
+    border-radius: 3px;
+    overflow: hidden;
+    margin-top: 6px;
+}
+.progress-bar { height: 100%; }
+
+.technical-details {
+    font-family: 'SFMono-Regular', Consolas, 'Liberation Mono', Menlo, monospace;
+    font-size: 0.75em;
+    color: var(--text-secondary);
+    background: #f3f4f6;
+    padding: 2px 6px;
+    border-radius: 4px;
+    display: inline-block;
+    max-width: 300px;
+    overflow: hidden;
+    text-overflow: ellipsis;
+    white-space: nowrap;
+}
+
+/* SVG Icons classes */
+.icon { width: 20px; height: 20px; vertical-align: bottom; }
+.icon-sm { width: 16px; height: 16px; margin-right: 4px; vertical-align: text-bottom; }
+
+.report-footer {
+    max-width: 1400px;
+    margin: 3rem auto 0;
+    padding: 1.25rem 2rem 0;
+    border-top: 1px solid var(--border-color);
+    text-align: center;
+    font-size: 0.8rem;
+    color: var(--text-secondary);
+}
+.report-footer a {
+    color: var(--text-secondary);
+    text-decoration: none;
+    display: inline-flex;
+    align-items: center;
+    gap: 0.4rem;
+    transition: color 0.15s ease;
+}
+.report-footer a:hover { color: var(--text-main); }
+.report-footer .sep { margin: 0 0.6rem; opacity: 0.5; }
+"""
+
+_REPORT_JS = """(function () {
+    // Dependency-free replacement for DataTables: group by domain, sort, search, status filter
+    const tbody = document.querySelector('#auditTable tbody');
+    const headers = document.querySelectorAll('#auditTable thead th');
+    const search = document.getElementById('tableSearch');
+    const entries = Array.from(tbody.rows, row => ({
+        row: row,
+        cells: Array.from(row.cells, cell => cell.textContent.trim()),
+        text: row.textContent.toLowerCase(),
+    }));
+    let statusFilter = null;
+    let sortCol = 1, sortDir = 1;
+
+    function render() {
+        const needle = search.value.trim().toLowerCase();
+        const visible = entries.filter(e =>
+            (!statusFilter || statusFilter.test(e.cells[2])) && (!needle || e.text.includes(needle)));
+        // Rows stay grouped by domain; the domain order follows sortDir only when sorting by Domain
+        const domainDir = sortCol === 0 ? sortDir : 1;
+        visible.sort((a, b) => domainDir * a.cells[0].localeCompare(b.cells[0]) ||
+            sortDir * a.cells[sortCol].localeCompare(b.cells[sortCol], undefined, {numeric: true}));
+
+        const groups = new Map();
+        for (const e of visible) {
+            if (!groups.has(e.cells[0])) groups.set(e.cells[0], []);
+            groups.get(e.cells[0]).push(e.row);
+        }
+        const frag = document.createDocumentFragment();
+        for (const [domain, rows] of groups) {
+            const header = document.createElement('tr');
+            header.className = 'group-row';
+            const cell = header.insertCell();
+            cell.colSpan = 4;
+            const badge = document.createElement('span');
+            badge.className = 'badge bg-secondary rounded-pill ms-2';
+            badge.style.fontSize = '0.7em';
+            badge.textContent = rows.length + ' Checks';
+            cell.append(domain, ' ', badge);
+            frag.append(header, ...rows);
+        }
+        if (!groups.size) {
+            const empty = document.createElement('tr');
+            const cell = empty.insertCell();
+            cell.colSpan = 4;
+            cell.className = 'text-muted';
+            cell.textContent = 'No matching records found';
+            frag.append(empty);
+        }
+        tbody.replaceChildren(frag);
+        headers.forEach((th, i) => th.dataset.sort = i === sortCol ? sortDir : '');
+    }
+
+    headers.forEach((th, i) => th.addEventListener('click', () => {
+        sortDir = i === sortCol ? -sortDir : 1;
+        sortCol = i;
+        render();
+    }));
+    search.addEventListener('input', render);
+
+    // Status filter (matches rendered text of the Status column)
+    document.querySelectorAll('#statusFilter button').forEach(button => button.addEventListener('click', () => {
+        document.querySelectorAll('#statusFilter button').forEach(b => b.classList.remove('active'));
+        button.classList.add('active');
+        statusFilter = button.dataset.filter ? new RegExp('^(' + button.dataset.filter + ')$') : null;
+        render();
+    }));
+    render();
+
+    // Data Freshness Check
+    const generatedAt = new Date(document.body.dataset.generatedAt);
+    const now = new Date();
+    const diffHours = (now - generatedAt) / (1000 * 60 * 60);
+
+    if (diffHours > 25) {
+        const banner = `
+        <div class="alert alert-danger d-flex align-items-center mb-4" role="alert">
+            <svg class="icon icon-lg me-2" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 8v4m0 4h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z"></path></svg>
+            <div>
+                <strong>DATA STALE WARNING:</strong> This report was generated more than 24 hours ago (${Math.round(diffHours)}h). The automated scan may have failed.
+            </div>
+        </div>`;
+        document.querySelector('.container-fluid.px-4').insertAdjacentHTML('afterbegin', banner);
+    }
+})();
+"""
+
+
+def _write_if_changed(path: str, content: str):
+    # Binary I/O: no text-mode decoding or newline translation on either side
+    data = content.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return
+    except FileNotFoundError:
+        pass
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+# Expiry bar colour: red under a week, amber under a month, green otherwise
+def _bar_color(days: int) -> str:
+    if days < 7:
+        return '#ef4444'
+    if days < 30:
+        return '#f59e0b'
+    return '#10b981'
+
+
+def _report_row(result: dict) -> dict:
+    """Result dict plus the display fields the template would otherwise compute per row."""
+    row = {}
+    days = result.get("days_until_expiry")
+    if days is not None:
+        row["expiry_pct"] = round(min(100.0, max(0.0, days / 365 * 100)), 1)
+        row["bar_color"] = _bar_color(days)
+    details = result.get("details")
+    if details:
+        # Serialized once for the tooltip, sliced for the visible text
+        details_json = orjson.dumps(details, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode()
+        row["details_json"] = details_json
+        row["details_short"] = details_json if len(details_json) <= 60 else details_json[:59] + "\u2026"
+    return {**result, **row} if row else result
+
+
+@lru_cache(maxsize=None)
+def _get_env(template_dir: str) -> Environment:
+    """
+    One Jinja environment per template dir, shared by every HTMLGenerator.
+    Compiled templates are kept in memory by the environment and on disk by the
+    bytecode cache (in the system temp dir), so they are only parsed once.
+    The template is static at runtime, so no per-render mtime check is needed.
+    """
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=select_autoescape(['html', 'xml']),
+        auto_reload=False,
+        cache_size=50,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+
+
+class HTMLGenerator:
+    def __init__(self, template_dir: str = "src/templates", output_dir: str = "reports",
+                 gzip_json: bool = False, pretty_json: bool = False):
+        self.output_dir = output_dir
+        # Write report.json.gz instead of report.json
+        self.gzip_json = gzip_json
+        # Indent the JSON report for human readers (larger file)
+        self.pretty_json = pretty_json
+        os.makedirs(output_dir, exist_ok=True)
+        os.makedirs(template_dir, exist_ok=True)
+        self._create_default_template(os.path.join(template_dir, "report.html"))
+        self._write_static_assets()
+        self.env = _get_env(template_dir)
+        self._template = self.env.get_template("report.html")
+
+    def _create_default_template(self, path: str):
+        # Only write when the bundled template changed: rewriting it every run bumps
+        # its mtime and forces Jinja to recompile it
+        _write_if_changed(path, _DEFAULT_TEMPLATE)
+
+    def _write_static_assets(self):
+        """CSS/JS referenced by index.html; unchanged files keep their mtime (and browser caches)."""
+        _write_if_changed(os.path.join(self.output_dir, "report.css"), _REPORT_CSS)
+        _write_if_changed(os.path.join(self.output_dir, "report.js"), _REPORT_JS)
 
     def generate(self, results: list):
-        template = self.env.get_template("report.html")
-        
-        # Stats
+        # Stats and display rows in one pass over the results
         stats = {"ok": 0, "warning": 0, "critical": 0}
         cat_stats = {"domain": 0, "ssl": 0, "security": 0, "blacklist": 0}
-        
+        rows = []
+
         for r in results:
+            rows.append(_report_row(r))
             s = r.get("status", "ok")
-            if s == "error": s = "critical"
-            
-            # Global Stats
-            if s in stats:
-                stats[s] += 1
-            else:
-                stats["critical"] += 1
-                
-            # Category Stats (Count only if NOT ok)
-            if s != "ok":
-                monitor = r.get("monitor", "unknown").lower()
-                if monitor in cat_stats:
-                    cat_stats[monitor] += 1
+            if s == "ok":
+                stats["ok"] += 1
+                continue
+            # error and unknown statuses count as critical
+            stats["warning" if s == "warning" else "critical"] += 1
+
+            # Category Stats (Count only if NOT ok); monitor names are lowercase
+            monitor = r.get("monitor")
+            if monitor in cat_stats:
+                cat_stats[monitor] += 1
+
+        issues = stats["critical"] + stats["warning"]
+        # Round half up like Jinja's |round did (62.5 -> 63); builtin round() is banker's
+        compliance = int((len(results) - issues) / len(results) * 100 + 0.5) if issues else 100
+        if stats["critical"]:
+            compliance_color = 'var(--danger-text)'
+        elif stats["warning"]:
+            compliance_color = 'var(--warning-text)'
+        else:
+            compliance_color = 'var(--success-text)'
 
         now_utc = datetime.now(timezone.utc)
-        html_content = template.render(
-            results=results,
+        # Stream the rendered HTML to disk in chunks instead of building one big string
+        stream = self._template.stream(
+            rows=rows,
+            compliance=compliance,
+            compliance_color=compliance_color,
             timestamp=now_utc.strftime("%Y-%m-%d %H:%M:%S UTC"),
             timestamp_iso=now_utc.isoformat(), # ISO 8601 for JS
             stats=stats,
             cat_stats=cat_stats
         )
-        
+        stream.enable_buffering(size=64)
+
         output_file = os.path.join(self.output_dir, "index.html")
-        with open(output_file, "w") as f:
-            f.write(html_content)
+        stream.dump(output_file, encoding="utf-8")
+        # index.html is useless without its assets; restore them if they were cleaned up
+        self._write_static_assets()
         
-        json_file = os.path.join(self.output_dir, f"report.json")
-        with open(json_file, "w") as f:
-            json.dump(results, f, indent=2, default=str)
+        # Compact JSON by default: the file is for machines, indentation only adds bytes
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if self.pretty_json else 0)
+        data = orjson.dumps(results, default=str, option=option)
+        json_file = os.path.join(self.output_dir, "report.json")
+        if self.gzip_json:
+            with gzip.open(f"{json_file}.gz", "wb", compresslevel=6) as f:
+                f.write(data)
+            stale = json_file
+        else:
+            with open(json_file, "wb") as f:
+                f.write(data)
+            stale = f"{json_file}.gz"
+        # Drop the other format left by a run with the opposite setting, so
+        # readers never pick up an outdated report
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(stale)
             
         return output_file
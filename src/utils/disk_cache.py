@@ -0,0 +1,67 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+from loguru import logger
+
+DEFAULT_CACHE_DIR = "~/.domainmate/cache"
+
+
+class DiskCache:
+    """
+    Persistent TTL cache for monitor results, shared between CLI runs.
+
+    Each entry is a small JSON file ``<dir>/<namespace>/<sha256(key)>.json``
+    holding the value and its absolute expiry (epoch seconds). Writes are
+    atomic (temp file + rename), so concurrent checks never read partial data.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = os.path.expanduser(directory)
+
+    def _path(self, namespace: str, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, namespace, f"{digest}.json")
+
+    def get(self, namespace: str, key: str) -> Optional[dict]:
+        """Return the cached value, or None if missing, expired or unreadable."""
+        path = self._path(namespace, key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+        if entry.get("expires_at", 0) <= time.time():
+            return None
+        return entry.get("value")
+
+    def set(self, namespace: str, key: str, value: dict, ttl: float):
+        """Store ``value`` for ``ttl`` seconds. Failures are logged, never raised."""
+        path = self._path(namespace, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"expires_at": time.time() + ttl, "value": value}, f, default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry {path}: {e}")
+
+
+def expiry_cache_ttl(result: dict, max_ttl: float = 86400) -> Optional[float]:
+    """
+    TTL for expiry-based results (WHOIS, SSL): one hour per day left, capped at
+    ``max_ttl``, so entries refresh more often as the expiry date approaches.
+    Returns None (do not cache) for errors or results without an expiry.
+    """
+    days = result.get("days_until_expiry")
+    if result.get("status") == "error" or days is None or days <= 0:
+        return None
+    return min(max_ttl, days * 3600)
@@ -0,0 +1,143 @@
+import asyncio
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+import dns.resolver
+
+# Authoritative "does not exist" answers are safe to cache briefly;
+# timeouts and network errors are never cached.
+_NEGATIVE_EXCEPTIONS = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical async calls: while a call for ``key`` is in
+    flight, later callers await the same task instead of starting their own.
+    Tasks are tracked per event loop, so callers on different loops never share.
+    """
+
+    def __init__(self):
+        self._inflight: dict = {}
+
+    async def do(self, key, coro_factory):
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            task = loop.create_task(coro_factory())
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(flight_key, None))
+        # shield: one caller being cancelled must not cancel the shared lookup
+        return await asyncio.shield(task)
+
+
+class DNSCache:
+    """
+    In-process LRU cache of DNS answers keyed by (name, rdtype).
+
+    Positive answers live for the record TTL, capped at ``max_ttl``.
+    NXDOMAIN / NoAnswer are cached for ``negative_ttl`` and re-raised on hit.
+    The lock is never held across I/O, so the cache is safe to share between
+    worker threads and event-loop code alike.
+    """
+
+    def __init__(self, maxsize: int = 4096, max_ttl: float = 900.0, negative_ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._singleflight = SingleFlight()
+
+    @staticmethod
+    def _key(qname: str, rdtype: str) -> tuple:
+        return (str(qname).lower().rstrip("."), rdtype.upper())
+
+    def get(self, qname: str, rdtype: str):
+        """
+        Return the cached answer, or None on a miss.
+        Re-raises the original exception for a cached negative answer.
+        """
+        key = self._key(qname, rdtype)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        if isinstance(value, Exception):
+            # Raise a copy: the cached instance is shared across threads/tracebacks
+            raise copy.copy(value)
+        return value
+
+    def set(self, qname: str, rdtype: str, value, ttl: float = None):
+        """Store an answer (or negative exception) for ``ttl`` seconds."""
+        if ttl is None:
+            ttl = self._answer_ttl(value)
+        key = self._key(qname, rdtype)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _answer_ttl(self, answer) -> float:
+        """
+        Record TTL, capped at ``max_ttl``: the rrset TTL of a dnspython Answer,
+        or the lowest per-record ``ttl`` of a list of DoH answers.
+        """
+        ttl = getattr(getattr(answer, "rrset", None), "ttl", None)
+        if ttl is None and isinstance(answer, list):
+            ttl = min((r.ttl for r in answer if getattr(r, "ttl", None) is not None), default=None)
+        if ttl is None:
+            return self.max_ttl
+        return min(float(ttl), self.max_ttl)
+
+    # ── Read-through helpers ──────────────────────────────────────────────────
+
+    def resolve(self, qname: str, rdtype: str, fetch):
+        """Return a cached answer or call ``fetch()`` and cache its outcome."""
+        cached = self.get(qname, rdtype)
+        if cached is not None:
+            return cached
+        try:
+            answer = fetch()
+        except _NEGATIVE_EXCEPTIONS as e:
+            self.set(qname, rdtype, e, ttl=self.negative_ttl)
+            raise
+        self.set(qname, rdtype, answer)
+        return answer
+
+    async def aresolve(self, qname: str, rdtype: str, fetch):
+        """
+        Async variant of ``resolve``: ``fetch()`` must return an awaitable.
+        Concurrent misses for the same name share a single query.
+        """
+        cached = self.get(qname, rdtype)
+        if cached is not None:
+            return cached
+        return await self._singleflight.do(
+            self._key(qname, rdtype), lambda: self._afetch(qname, rdtype, fetch)
+        )
+
+    async def _afetch(self, qname: str, rdtype: str, fetch):
+        try:
+            answer = await fetch()
+        except _NEGATIVE_EXCEPTIONS as e:
+            self.set(qname, rdtype, e, ttl=self.negative_ttl)
+            raise
+        self.set(qname, rdtype, answer)
+        return answer
+
+
+# Shared by RobustResolver and the monitors so every lookup in a run hits one cache
+dns_cache = DNSCache()
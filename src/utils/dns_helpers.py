@@ -1,8 +1,39 @@
+import asyncio
+import dns.asyncresolver
+import dns.exception
 import dns.resolver
 import dns.rdatatype
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from loguru import logger
 import random
+import threading
+from src.utils.dns_cache import dns_cache
+
+# Queries served by one nameserver order before it is reshuffled
+_RESHUFFLE_EVERY = 100
+
+# Failures that suggest plain DNS is blocked or down, so DoH is worth a try.
+# NXDOMAIN / NoAnswer are authoritative and are re-raised as-is.
+_DOH_FALLBACK_ERRORS = (dns.exception.Timeout, dns.resolver.NoNameservers, OSError)
+
+
+class _DoHAnswer:
+    """
+    Minimal stand-in for a dnspython rdata, so DoH answers work with consumers
+    that call ``rdata.to_text()``. ``ttl`` lets the shared DNS cache expire
+    them like regular answers.
+    """
+    __slots__ = ("val", "ttl")
+
+    def __init__(self, val: str, ttl: int = None):
+        self.val = val
+        self.ttl = ttl
+
+    def to_text(self) -> str:
+        return self.val
 
 class RobustResolver:
     """
@@ -18,45 +49,87 @@ class RobustResolver:
         ]
         self.timeout = timeout
         self.total_timeout = total_timeout
+        # Shuffled once and then every _RESHUFFLE_EVERY queries, not on every query
+        self._queries = 0
+        self._shuffled_resolvers = random.sample(self.resolvers, len(self.resolvers))
+        # dnspython resolvers are not thread-safe to reconfigure, so keep one per thread
+        self._local = threading.local()
+        # Event-loop resolver for aresolve, built on first use
+        self._async_resolver = None
+        # Keep-alive session for the DoH fallback: one TLS handshake, not one per query
+        self._doh_session = requests.Session()
+        self._doh_session.headers.update({"Accept": "application/dns-json"})
+        self._doh_session.mount("https://", HTTPAdapter(
+            pool_maxsize=32,
+            max_retries=Retry(total=1, backoff_factor=0.1, status_forcelist=(502, 503, 504)),
+        ))
+
+    def _resolver(self) -> dns.resolver.Resolver:
+        """This thread's resolver, built once instead of per query."""
+        resolver = getattr(self._local, "resolver", None)
+        if resolver is None:
+            # configure=False: nameservers are set per query, no need to parse resolv.conf
+            resolver = dns.resolver.Resolver(configure=False)
+            resolver.timeout = self.timeout
+            resolver.lifetime = self.total_timeout
+            self._local.resolver = resolver
+        return resolver
 
     def resolve(self, qname: str, rdtype: str = 'A') -> list:
         """
         Resolve a query attempting multiple resolvers if necessary.
+        Answers (and NXDOMAIN/NoAnswer) are served from the shared TTL cache.
         """
-        # Shuffle resolvers to load balance and avoid hitting the same blocked one first every time
-        current_resolvers = self.resolvers.copy()
-        random.shuffle(current_resolvers)
-
-        # Create a customized resolver instance
-        resolver = dns.resolver.Resolver()
-        resolver.timeout = self.timeout
-        resolver.lifetime = self.total_timeout
-
-        last_exception = None
-
-        # Strategy: Try chunks of resolvers or just iterate? 
-        # Iterating through ALL might be slow if timeout is high. 
-        # Let's try up to 3 different sets of nameservers.
-        
-        # We can just set the nameservers to our full list? 
-        # Standard dns.resolver uses the list in order/round-robin. 
-        # But if we want *specific* fallback explicitly (e.g. if Google fails, try Cloudflare),
-        # we can just populate the default resolver with our robust list.
-        
-        resolver.nameservers = current_resolvers
+        return dns_cache.resolve(qname, rdtype, lambda: self._resolve_uncached(qname, rdtype))
+
+    async def aresolve(self, qname: str, rdtype: str = 'A') -> list:
+        """
+        Async variant of ``resolve``: queries run on the event loop (DoH fallback in a thread).
+        Concurrent lookups of the same name share a single query.
+        """
+        return await dns_cache.aresolve(qname, rdtype, lambda: self._aresolve_uncached(qname, rdtype))
+
+    async def resolve_many(self, names: list, rdtype: str = 'A') -> list:
+        """
+        Resolve ``names`` concurrently: total time is the slowest lookup, not the sum.
+        Each entry is the answer for that name, or the exception it raised.
+        """
+        return await asyncio.gather(*(self.aresolve(name, rdtype) for name in names), return_exceptions=True)
+
+    def _nameservers(self) -> list:
+        """
+        Shuffled resolver order, to load balance and avoid hitting the same blocked
+        one first every time. dnspython already rotates on failure, so reshuffling
+        every _RESHUFFLE_EVERY queries spreads load just as well.
+        """
+        self._queries += 1
+        if self._queries % _RESHUFFLE_EVERY == 0:
+            # Replaced, never shuffled in place: other threads may be reading it
+            self._shuffled_resolvers = random.sample(self.resolvers, len(self.resolvers))
+        return self._shuffled_resolvers
+
+    async def _aresolve_uncached(self, qname: str, rdtype: str) -> list:
+        if self._async_resolver is None:
+            self._async_resolver = dns.asyncresolver.Resolver(configure=False)
+            self._async_resolver.timeout = self.timeout
+            self._async_resolver.lifetime = self.total_timeout
+        # Read when the query starts, so concurrent queries can each set their own order
+        self._async_resolver.nameservers = self._nameservers()
 
         try:
-             # This will use the configured nameservers with the built-in logic of dnspython
-             return resolver.resolve(qname, rdtype)
-        except Exception as e:
-            # If the "batch" failed, maybe valid NXDOMAIN or NoAnswer?
-            # If NXDOMAIN, that's authoritative (usually).
-            if isinstance(e, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)):
-                raise e
-            
-            # If Timeout, we might want to try one last desperate attempt with system default?
-            # Or just raise. With 8+ resolvers, if all fail, it's likely down or network issue.
-            # Fallback to DoH (DNS over HTTPS) - Firewall piercing
+            return await self._async_resolver.resolve(qname, rdtype)
+        except _DOH_FALLBACK_ERRORS:
+            return await asyncio.to_thread(self._resolve_doh, qname, rdtype)
+
+    def _resolve_uncached(self, qname: str, rdtype: str) -> list:
+        resolver = self._resolver()
+        # dnspython walks the whole (shuffled) list, rotating on failure
+        resolver.nameservers = self._nameservers()
+
+        try:
+            return resolver.resolve(qname, rdtype)
+        except _DOH_FALLBACK_ERRORS:
+            # Every resolver failed: likely blocked UDP/53, so fall back to DoH (DNS over HTTPS)
             return self._resolve_doh(qname, rdtype)
 
     def _resolve_doh(self, qname: str, rdtype: str) -> list:
@@ -67,28 +140,17 @@ class RobustResolver:
             # Cloudflare DoH API
             url = "https://cloudflare-dns.com/dns-query"
             params = {"name": qname, "type": rdtype}
-            headers = {"Accept": "application/dns-json"}
-            
-            response = requests.get(url, params=params, headers=headers, timeout=self.timeout)
+
+            response = self._doh_session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get("Status") == 0 and "Answer" in data:
-                # Mock Rdata object to mimic dnspython response (or just return simpler list?)
-                # For compatibility with BlacklistMonitor which expects rdata.to_text(),
-                # we should construct a simple object or just return strings if we change the consumer.
-                # To minimize consumer change, let's return a list of objects with a to_text() method.
-                
-                class DoHAnswer:
-                    def __init__(self, val): self.val = val
-                    def to_text(self): return self.val
-
                 wanted_type = dns.rdatatype.from_text(rdtype)
-                answers = []
-                for ans in data["Answer"]:
-                    if ans["type"] == wanted_type:
-                        answers.append(DoHAnswer(ans["data"]))
-                
+                answers = [
+                    _DoHAnswer(ans["data"], ans.get("TTL"))
+                    for ans in data["Answer"] if ans["type"] == wanted_type
+                ]
                 if answers:
                     return answers
                     
@@ -105,8 +167,22 @@ class RobustResolver:
         try:
             # Try 127.0.0.1 for localhost logic if needed, but assuming external scans
             answers = self.resolve(domain, 'A')
-            for rdata in answers:
-                return rdata.to_text()
-            raise Exception("No A records found")
+            ip = next((rdata.to_text() for rdata in answers), None)
+            if ip is None:
+                raise Exception("No A records found")
+            return ip
+        except Exception as e:
+            raise Exception(f"Failed to resolve IP for {domain}: {e}")
+
+    async def aget_ip(self, domain: str) -> str:
+        """
+        Async variant of ``get_ip``.
+        """
+        try:
+            answers = await self.aresolve(domain, 'A')
+            ip = next((rdata.to_text() for rdata in answers), None)
+            if ip is None:
+                raise Exception("No A records found")
+            return ip
         except Exception as e:
             raise Exception(f"Failed to resolve IP for {domain}: {e}")
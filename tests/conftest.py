@@ -0,0 +1,11 @@
+import pytest
+
+from src.utils.dns_cache import dns_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_dns_cache():
+    # The DNS cache is process-wide: keep answers from leaking between tests
+    dns_cache.clear()
+    yield
+    dns_cache.clear()
@@ -1,7 +1,15 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
 import pytest
+from fastapi import HTTPException
 from pydantic import ValidationError
 
-from api.api import AnalyzeRequest, get_metrics, app
+from starlette.requests import Request
+
+import api.api as api_module
+from api.api import AnalyzeRequest, _analyze_core, enqueue_notification, get_metrics, lifespan, app
+from src.constants import API_BATCH_MAX_DOMAINS
 
 
 def test_valid_domain_normalized():
@@ -24,3 +32,58 @@ def test_metrics_shape():
     assert m["status"] == "healthy"
     assert m["monitors_active"] == 5
     assert m["version"] == app.version
+
+
+def test_queued_notifications_are_sent_before_shutdown():
+    async def run():
+        async with lifespan(app):
+            assert enqueue_notification("Title", "Body", "warning")
+
+    with patch("api.api.notifier.send_notification", new=AsyncMock()) as send, \
+            patch("api.api.NOTIFY_BATCH_WAIT", 0.01):
+        asyncio.run(run())
+    send.assert_awaited_once_with("Title", "Body", "warning")
+
+
+def test_analyze_core_runs_only_selected_monitors():
+    req = AnalyzeRequest(
+        domain="example.com", check_domain=False, check_ssl=False, check_security=False, check_blacklist=False
+    )
+    ok = {"monitor": "dns", "status": "ok", "message": "SPF and DMARC present"}
+    with patch("api.api.dns_monitor.check_async", new=AsyncMock(return_value=ok)):
+        res = asyncio.run(_analyze_core(req))
+    assert res["domain"] == "example.com"
+    assert list(res["results"]) == ["dns"]
+    assert res["issues_found"] == 0
+
+
+def test_batch_route_caps_domain_count():
+    body = app.openapi()["paths"]["/analyze/batch"]["post"]["requestBody"]["content"]["application/json"]
+    assert body["schema"]["minItems"] == 1
+    assert body["schema"]["maxItems"] == API_BATCH_MAX_DOMAINS
+
+
+def test_notify_test_is_sent_unbatched_with_requested_level():
+    request = Request({
+        "type": "http", "method": "POST", "path": "/notify/test", "headers": [],
+        "query_string": b"", "client": ("127.0.0.1", 1234), "app": app,
+    })
+    req = api_module.TestNotificationRequest(title="Test", message="Hello", level="info")
+    with patch("api.api.notifier.send_notification", new=AsyncMock(return_value=["telegram"])) as send, \
+            patch("api.api.enqueue_notification") as enqueue:
+        res = asyncio.run(api_module.test_notification(request, req))
+    send.assert_awaited_once_with("Test", "Hello", "info", dedup=False)
+    enqueue.assert_not_called()
+    assert res["status"] == "sent" and res["channels"] == ["telegram"]
+
+
+def test_notify_test_fails_when_nothing_delivered():
+    request = Request({
+        "type": "http", "method": "POST", "path": "/notify/test", "headers": [],
+        "query_string": b"", "client": ("127.0.0.1", 1234), "app": app,
+    })
+    req = api_module.TestNotificationRequest(title="Test", message="Hello", level="info")
+    with patch("api.api.notifier.send_notification", new=AsyncMock(return_value=[])):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(api_module.test_notification(request, req))
+    assert exc.value.status_code == 502
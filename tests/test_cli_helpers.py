@@ -1,4 +1,7 @@
-from src.cli import clean_domain, get_parent_domain, get_demo_data
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from src.cli import clean_domain, get_parent_domain, get_demo_data, resolve_connectable_async
 
 
 def test_clean_domain_strips_protocol_and_path():
@@ -13,6 +16,11 @@ def test_clean_domain_lowercases_and_trims():
     assert clean_domain("  EXAMPLE.COM  ") == "example.com"
 
 
+def test_clean_domain_strips_fragment_and_port_with_path():
+    assert clean_domain("HTTP://Example.com:8080/path#top") == "example.com"
+    assert clean_domain("example.com#frag") == "example.com"
+
+
 def test_clean_domain_plain_passthrough():
     assert clean_domain("sub.example.org") == "sub.example.org"
 
@@ -22,6 +30,11 @@ def test_get_parent_domain_from_subdomain():
     assert get_parent_domain("a.b.example.com") == "example.com"
 
 
+def test_get_parent_domain_multi_label_suffix():
+    assert get_parent_domain("www.example.co.uk") == "example.co.uk"
+    assert get_parent_domain("shop.example.com.br") == "example.com.br"
+
+
 def test_get_parent_domain_root_unchanged():
     assert get_parent_domain("example.com") == "example.com"
 
@@ -34,3 +47,15 @@ def test_demo_data_shape():
         assert r["status"] in valid_statuses
         assert r["domain"]
         assert r["monitor"] in {"domain", "ssl", "dns", "blacklist"}
+
+
+def test_resolve_connectable_skips_www_when_root_resolves():
+    with patch("src.cli._RESOLVER.aget_ip", new=AsyncMock(return_value="1.2.3.4")) as get_ip:
+        assert asyncio.run(resolve_connectable_async("example.com")) == ("example.com", "1.2.3.4")
+    get_ip.assert_awaited_once_with("example.com")
+
+
+def test_resolve_connectable_falls_back_to_www():
+    lookup = AsyncMock(side_effect=[Exception("NXDOMAIN"), "5.6.7.8"])
+    with patch("src.cli._RESOLVER.aget_ip", new=lookup):
+        assert asyncio.run(resolve_connectable_async("example.com")) == ("www.example.com", "5.6.7.8")
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.monitors.domain_monitor import DomainMonitor
+from src.utils.disk_cache import DiskCache, expiry_cache_ttl
+
+
+def test_roundtrip_and_expiry(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    with patch("src.utils.disk_cache.time.time", return_value=1000.0):
+        cache.set("ssl", "example.com", {"status": "ok"}, ttl=60)
+    with patch("src.utils.disk_cache.time.time", return_value=1059.0):
+        assert cache.get("ssl", "example.com") == {"status": "ok"}
+    with patch("src.utils.disk_cache.time.time", return_value=1061.0):
+        assert cache.get("ssl", "example.com") is None
+
+
+def test_missing_and_corrupt_entries_are_misses(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.get("ssl", "example.com") is None
+    path = cache._path("ssl", "example.com")
+    (tmp_path / "ssl").mkdir()
+    with open(path, "w") as f:
+        f.write("{not json")
+    assert cache.get("ssl", "example.com") is None
+
+
+def test_expiry_ttl_shrinks_near_expiry():
+    assert expiry_cache_ttl({"status": "ok", "days_until_expiry": 200}) == 86400
+    assert expiry_cache_ttl({"status": "critical", "days_until_expiry": 3}) == 3 * 3600
+    assert expiry_cache_ttl({"status": "critical", "days_until_expiry": -2}) is None
+    assert expiry_cache_ttl({"status": "error", "message": "WHOIS failed"}) is None
+
+
+def test_monitor_reuses_cached_result(tmp_path):
+    monitor = DomainMonitor()
+    monitor.result_cache = DiskCache(str(tmp_path))
+    w = SimpleNamespace(expiration_date=datetime.now() + timedelta(days=100), registrar="R")
+    with patch("src.monitors.domain_monitor.whois.whois", return_value=w) as lookup:
+        first = monitor.check_domain("example.com")
+        second = monitor.check_domain("example.com")
+    assert lookup.call_count == 1
+    assert second == first
+
+
+def test_monitor_does_not_cache_errors(tmp_path):
+    monitor = DomainMonitor()
+    monitor.result_cache = DiskCache(str(tmp_path))
+    w = SimpleNamespace(expiration_date=None, registrar=None)
+    with patch("src.monitors.domain_monitor.whois.whois", return_value=w) as lookup:
+        monitor.check_domain("example.com")
+        monitor.check_domain("example.com")
+    assert lookup.call_count == 2
@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import dns.resolver
+import pytest
+
+from src.utils.dns_cache import DNSCache
+
+
+def _answer(ttl):
+    return SimpleNamespace(rrset=SimpleNamespace(ttl=ttl))
+
+
+def test_hit_skips_fetch():
+    cache = DNSCache()
+    fetch = Mock(return_value=_answer(300))
+    first = cache.resolve("Example.com.", "a", fetch)
+    assert cache.resolve("example.com", "A", fetch) is first
+    fetch.assert_called_once()
+
+
+def test_entry_expires_after_record_ttl():
+    cache = DNSCache()
+    with patch("src.utils.dns_cache.time.monotonic", return_value=1000.0):
+        cache.set("example.com", "A", _answer(30))
+    with patch("src.utils.dns_cache.time.monotonic", return_value=1029.0):
+        assert cache.get("example.com", "A") is not None
+    with patch("src.utils.dns_cache.time.monotonic", return_value=1031.0):
+        assert cache.get("example.com", "A") is None
+
+
+def test_ttl_capped_at_max_ttl():
+    cache = DNSCache(max_ttl=900)
+    assert cache._answer_ttl(_answer(86400)) == 900
+    assert cache._answer_ttl(["no-rrset"]) == 900
+
+
+def test_doh_answer_list_uses_lowest_record_ttl():
+    cache = DNSCache(max_ttl=900)
+    answers = [SimpleNamespace(ttl=300), SimpleNamespace(ttl=120)]
+    assert cache._answer_ttl(answers) == 120
+
+
+def test_nxdomain_cached_and_reraised():
+    cache = DNSCache()
+    fetch = Mock(side_effect=dns.resolver.NXDOMAIN())
+    for _ in range(2):
+        with pytest.raises(dns.resolver.NXDOMAIN):
+            cache.resolve("missing.example", "A", fetch)
+    fetch.assert_called_once()
+
+
+def test_timeouts_not_cached():
+    cache = DNSCache()
+    fetch = Mock(side_effect=dns.resolver.LifetimeTimeout(timeout=1.0, errors=[]))
+    for _ in range(2):
+        with pytest.raises(dns.resolver.LifetimeTimeout):
+            cache.resolve("slow.example", "A", fetch)
+    assert fetch.call_count == 2
+
+
+def test_lru_eviction():
+    cache = DNSCache(maxsize=2)
+    cache.set("a.test", "A", _answer(60))
+    cache.set("b.test", "A", _answer(60))
+    cache.get("a.test", "A")  # a becomes most recently used
+    cache.set("c.test", "A", _answer(60))
+    assert cache.get("b.test", "A") is None
+    assert cache.get("a.test", "A") is not None
+
+
+def test_concurrent_async_misses_share_one_query():
+    cache = DNSCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return _answer(300)
+
+    async def run():
+        return await asyncio.gather(*(cache.aresolve("example.com", "A", fetch) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
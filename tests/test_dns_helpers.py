@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+
+import dns.exception
+import dns.resolver
+import pytest
+
+from src.utils.dns_cache import dns_cache
+from src.utils.dns_helpers import RobustResolver
+
+
+def test_resolver_reused_within_thread_not_across():
+    resolver = RobustResolver(timeout=1.0, total_timeout=3.0)
+    first = resolver._resolver()
+    assert resolver._resolver() is first
+    assert (first.timeout, first.lifetime) == (1.0, 3.0)
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(resolver._resolver()))
+    thread.start()
+    thread.join()
+    assert other[0] is not first
+
+
+def test_resolve_many_runs_lookups_concurrently():
+    resolver = RobustResolver()
+    running = []
+    peak = []
+
+    async def slow_lookup(qname, rdtype):
+        running.append(qname)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(qname)
+        if qname == "missing.test":
+            raise dns.resolver.NXDOMAIN()
+        return [qname]
+
+    dns_cache.clear()
+    with patch.object(resolver, "_aresolve_uncached", side_effect=slow_lookup):
+        answers = asyncio.run(resolver.resolve_many(["a.test", "missing.test", "b.test"]))
+    dns_cache.clear()
+    assert answers[0] == ["a.test"] and answers[2] == ["b.test"]
+    assert isinstance(answers[1], dns.resolver.NXDOMAIN)
+    assert max(peak) == 3
+
+
+def test_doh_fallback_uses_shared_session():
+    resolver = RobustResolver()
+    resolver._doh_session.get = Mock()
+    resolver._doh_session.get.return_value.content = b'{"Status": 0, "Answer": [{"type": 1, "data": "1.2.3.4", "TTL": 60}]}'
+    assert [a.to_text() for a in resolver._resolve_doh("example.com", "A")] == ["1.2.3.4"]
+    assert [a.to_text() for a in resolver._resolve_doh("example.org", "A")] == ["1.2.3.4"]
+    assert resolver._doh_session.get.call_count == 2
+    assert resolver._doh_session.headers["Accept"] == "application/dns-json"
+
+
+def test_nameserver_order_reshuffled_periodically():
+    resolver = RobustResolver()
+    first = resolver._nameservers()
+    assert sorted(first) == sorted(resolver.resolvers)
+    assert all(resolver._nameservers() is first for _ in range(98))
+    assert resolver._nameservers() is not first
+
+
+def test_timeout_falls_back_to_doh_but_nxdomain_does_not():
+    resolver = RobustResolver()
+    resolver._resolve_doh = Mock(return_value=["doh"])
+    with patch.object(resolver._resolver(), "resolve", side_effect=dns.exception.Timeout()):
+        assert resolver._resolve_uncached("example.com", "A") == ["doh"]
+    with patch.object(resolver._resolver(), "resolve", side_effect=dns.resolver.NXDOMAIN()):
+        with pytest.raises(dns.resolver.NXDOMAIN):
+            resolver._resolve_uncached("missing.test", "A")
+    resolver._resolve_doh.assert_called_once()
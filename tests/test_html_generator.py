@@ -1,4 +1,6 @@
+import gzip
 import json
+import os
 
 from src.reporting.html_generator import HTMLGenerator
 
@@ -43,3 +45,94 @@ def test_empty_results_do_not_crash(tmp_path):
     gen = HTMLGenerator(template_dir=str(tmp_path / "templates"), output_dir=str(tmp_path / "reports"))
     gen.generate([])
     assert (tmp_path / "reports" / "index.html").exists()
+
+
+def test_unchanged_template_is_not_rewritten(tmp_path):
+    templates = tmp_path / "templates"
+    HTMLGenerator(template_dir=str(templates), output_dir=str(tmp_path / "reports"))
+    path = templates / "report.html"
+    os.utime(path, (0, 0))
+    HTMLGenerator(template_dir=str(templates), output_dir=str(tmp_path / "reports"))
+    assert path.stat().st_mtime == 0
+
+
+def test_jinja_environment_shared_between_generators(tmp_path):
+    first = HTMLGenerator(template_dir=str(tmp_path / "templates"), output_dir=str(tmp_path / "reports"))
+    second = HTMLGenerator(template_dir=str(tmp_path / "templates"), output_dir=str(tmp_path / "reports"))
+    assert first.env is second.env
+
+
+def test_expiry_bar_and_compliance_precomputed(tmp_path):
+    _, reports_dir = _generate(tmp_path)
+    html = (reports_dir / "index.html").read_text()
+    assert "width: 27.4%; background-color: #10b981;" in html
+    assert "width: 0.0%; background-color: #ef4444;" in html
+    assert "25%" in html
+
+
+def test_compliance_rounds_half_up(tmp_path):
+    gen = HTMLGenerator(template_dir=str(tmp_path / "templates"), output_dir=str(tmp_path / "reports"))
+    results = [{"domain": f"d{i}.com", "monitor": "ssl", "status": "ok", "message": "m"} for i in range(5)]
+    results += [{"domain": f"e{i}.com", "monitor": "ssl", "status": "warning", "message": "m"} for i in range(3)]
+    gen.generate(results)
+    html = (tmp_path / "reports" / "index.html").read_text()
+    assert "63%" in html and "62%" not in html
+
+
+def test_details_serialized_and_truncated(tmp_path):
+    gen = HTMLGenerator(template_dir=str(tmp_path / "templates"), output_dir=str(tmp_path / "reports"))
+    details = {"headers": ["x" * 80]}
+    gen.generate([{"domain": "a.com", "monitor": "security", "status": "warning", "message": "m", "details": details}])
+    html = (tmp_path / "reports" / "index.html").read_text()
+    assert 'title="{&#34;headers&#34;:[&#34;' + "x" * 80 in html
+    assert "[&#34;" + "x" * 46 + "…</span>" in html
+
+
+def test_report_loads_no_cdn_assets(tmp_path):
+    _, reports_dir = _generate(tmp_path)
+    html = (reports_dir / "index.html").read_text()
+    assert "cdn" not in html and "googleapis" not in html
+    assert "jquery" not in html.lower()
+    assert 'id="tableSearch"' in html
+
+
+def test_static_assets_written_next_to_report(tmp_path):
+    _, reports_dir = _generate(tmp_path)
+    html = (reports_dir / "index.html").read_text()
+    assert '<link rel="stylesheet" href="report.css">' in html
+    assert '<script src="report.js" defer></script>' in html
+    assert "<style>" not in html
+    assert "generatedAt" in (reports_dir / "report.js").read_text()
+    assert (reports_dir / "report.css").stat().st_size > 0
+
+
+def test_static_assets_restored_on_generate(tmp_path):
+    gen = HTMLGenerator(template_dir=str(tmp_path / "templates"), output_dir=str(tmp_path / "reports"))
+    (tmp_path / "reports" / "report.css").unlink()
+    gen.generate(SAMPLE)
+    assert (tmp_path / "reports" / "report.css").exists()
+
+
+def test_json_report_compact_or_gzipped(tmp_path):
+    _, reports_dir = _generate(tmp_path)
+    assert b"\n" not in (reports_dir / "report.json").read_bytes()
+
+    gen = HTMLGenerator(template_dir=str(tmp_path / "templates"), output_dir=str(reports_dir), gzip_json=True)
+    gen.generate(SAMPLE)
+    assert not (reports_dir / "report.json").exists()
+    assert json.loads(gzip.decompress((reports_dir / "report.json.gz").read_bytes())) == SAMPLE
+
+
+def test_json_report_pretty_option(tmp_path):
+    gen = HTMLGenerator(template_dir=str(tmp_path / "templates"), output_dir=str(tmp_path / "reports"), pretty_json=True)
+    gen.generate(SAMPLE)
+    data = (tmp_path / "reports" / "report.json").read_bytes()
+    assert b"\n  " in data and json.loads(data) == SAMPLE
+
+
+def test_details_with_non_str_keys_render(tmp_path):
+    gen = HTMLGenerator(template_dir=str(tmp_path / "templates"), output_dir=str(tmp_path / "reports"))
+    gen.generate([{"domain": "a.com", "monitor": "security", "status": "warning", "message": "m",
+                   "details": {443: "open", "port": 80}}])
+    html = (tmp_path / "reports" / "index.html").read_text()
+    assert "&#34;443&#34;:&#34;open&#34;" in html
@@ -1,10 +1,18 @@
-from datetime import datetime, timedelta
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import dns.exception
+import dns.resolver
+
+from src.monitors.base_monitor import BaseMonitor
+from src.monitors.blacklist_monitor import BlacklistMonitor
 from src.monitors.domain_monitor import DomainMonitor
 from src.monitors.dns_monitor import DNSMonitor
 from src.monitors.security_monitor import SecurityMonitor
+from src.monitors.ssl_monitor import SSLMonitor
 
 
 def _whois_result(days_from_now, as_list=False):
@@ -42,6 +50,74 @@ class TestDomainMonitor:
         assert res["status"] == "error"
         assert res["monitor"] == "domain"
 
+    def test_async_lookup_times_out(self):
+        monitor = DomainMonitor()
+        monitor.timeout = 0.05
+
+        def slow_whois(domain, timeout):
+            time.sleep(0.3)
+            return _whois_result(100)
+
+        with patch("src.monitors.domain_monitor.whois.whois", side_effect=slow_whois):
+            res = asyncio.run(monitor.check_domain_async("example.com"))
+        assert res["status"] == "error"
+        assert "timed out" in res["message"]
+
+
+def _fake_tls_connection(cert):
+    writer = MagicMock()
+    writer.get_extra_info.return_value = cert
+    writer.wait_closed = AsyncMock()
+    return AsyncMock(return_value=(MagicMock(), writer)), writer
+
+
+def _cert(days_from_now):
+    exp = datetime.now(timezone.utc) + timedelta(days=days_from_now, hours=1)
+    return {
+        "notAfter": exp.strftime("%b %d %H:%M:%S %Y GMT"),
+        "issuer": ((("commonName", "Test CA"),),),
+        "version": 3,
+    }
+
+
+class TestSSLMonitor:
+    def test_valid_cert(self):
+        open_conn, writer = _fake_tls_connection(_cert(90))
+        with patch("src.monitors.ssl_monitor.asyncio.open_connection", open_conn):
+            res = SSLMonitor().check_ssl("example.com")
+        assert res["status"] == "ok"
+        assert res["days_until_expiry"] == 90
+        assert res["issuer"] == "Test CA"
+        assert open_conn.await_args.kwargs["server_hostname"] == "example.com"
+        writer.close.assert_called_once()
+
+    def test_expiring_cert_is_critical(self):
+        open_conn, _ = _fake_tls_connection(_cert(3))
+        with patch("src.monitors.ssl_monitor.asyncio.open_connection", open_conn):
+            assert SSLMonitor().check_ssl("example.com")["status"] == "critical"
+
+    def test_preresolved_ip_and_port(self):
+        open_conn, _ = _fake_tls_connection(_cert(90))
+        with patch("src.monitors.ssl_monitor.asyncio.open_connection", open_conn):
+            SSLMonitor().check_ssl("example.com", port=8443, ip="192.0.2.1")
+        assert open_conn.await_args.args[:2] == ("192.0.2.1", 8443)
+        assert open_conn.await_args.kwargs["server_hostname"] == "example.com"
+
+    def test_parses_openssl_padded_day(self):
+        res = SSLMonitor()._parse_cert("example.com", {"notAfter": "Jan  5 12:00:00 2099 GMT"})
+        assert res["expiration_date"] == "2099-01-05"
+
+    def test_unparseable_not_after_is_error(self):
+        res = SSLMonitor()._parse_cert("example.com", {"notAfter": "not a date"})
+        assert res["status"] == "error"
+
+    def test_connection_failure_is_error(self):
+        open_conn = AsyncMock(side_effect=ConnectionRefusedError())
+        with patch("src.monitors.ssl_monitor.asyncio.open_connection", open_conn):
+            res = SSLMonitor().check_ssl("example.com")
+        assert res["status"] == "error"
+        assert res["monitor"] == "ssl"
+
 
 class _FakeTXT:
     def __init__(self, *chunks):
@@ -49,7 +125,7 @@ class _FakeTXT:
 
 
 def _fake_resolve(spf_chunks=None, dmarc=None):
-    def resolve(qname, rdtype):
+    async def resolve(qname, rdtype):
         if str(qname).startswith("_dmarc."):
             if dmarc is None:
                 raise Exception("NXDOMAIN")
@@ -61,11 +137,16 @@ def _fake_resolve(spf_chunks=None, dmarc=None):
     return resolve
 
 
+def _check_dns(fake):
+    monitor = DNSMonitor()
+    monitor.resolver.resolve = AsyncMock(side_effect=fake)
+    return monitor.check_dns("example.com")
+
+
 class TestDNSMonitor:
     def test_spf_and_dmarc_present(self):
         fake = _fake_resolve(spf_chunks=["v=spf1 include:_spf.google.com ~all"], dmarc="v=DMARC1; p=reject;")
-        with patch("src.monitors.dns_monitor.dns.resolver.resolve", side_effect=fake):
-            res = DNSMonitor().check_dns("example.com")
+        res = _check_dns(fake)
         assert res["status"] == "ok"
         assert res["message"] == "SPF and DMARC present"
         assert res["spf"]["status"] == "present"
@@ -74,15 +155,13 @@ class TestDNSMonitor:
     def test_multistring_spf_joined(self):
         # Long SPF records are split into 255-byte character-strings; they must be joined
         fake = _fake_resolve(spf_chunks=["v=spf1 include:a.example.com ", "include:b.example.com ~all"])
-        with patch("src.monitors.dns_monitor.dns.resolver.resolve", side_effect=fake):
-            res = DNSMonitor().check_dns("example.com")
+        res = _check_dns(fake)
         assert res["spf"]["status"] == "present"
         assert res["spf"]["record"] == "v=spf1 include:a.example.com include:b.example.com ~all"
 
     def test_missing_dmarc_is_warning(self):
         fake = _fake_resolve(spf_chunks=["v=spf1 ~all"], dmarc=None)
-        with patch("src.monitors.dns_monitor.dns.resolver.resolve", side_effect=fake):
-            res = DNSMonitor().check_dns("example.com")
+        res = _check_dns(fake)
         assert res["status"] == "warning"
         assert "DMARC" in res["message"]
 
@@ -92,5 +171,94 @@ class TestSecurityMonitor:
         leaks = SecurityMonitor().check_info_leakage({"Server": "nginx/1.25", "X-Powered-By": "PHP/8.2"})
         assert len(leaks) == 2
 
+    def test_info_leakage_header_case_insensitive(self):
+        leaks = SecurityMonitor().check_info_leakage({"x-aspnet-version": "4.0.30319"})
+        assert leaks == ["ASP.NET Version Disclosed: 4.0.30319"]
+
     def test_no_leakage_on_clean_headers(self):
         assert SecurityMonitor().check_info_leakage({"Content-Type": "text/html"}) == []
+
+    def test_session_sends_domainmate_user_agent(self):
+        assert SecurityMonitor().session.headers["User-Agent"] == SecurityMonitor.user_agent
+
+
+class _FakeA:
+    def __init__(self, ip):
+        self.ip = ip
+
+    def to_text(self):
+        return self.ip
+
+
+def _fake_rbl_resolve(listings):
+    async def resolve(qname, rdtype, lifetime=None):
+        for rbl, ip in listings.items():
+            if qname.endswith(f".{rbl}"):
+                return [_FakeA(ip)]
+        raise dns.resolver.NXDOMAIN()
+    return resolve
+
+
+class TestBlacklistMonitor:
+    def _check(self, listings, rbls=("rbl-a.test", "rbl-b.test", "rbl-c.test"), stop_after=None):
+        monitor = BlacklistMonitor(rbls=list(rbls), stop_after=stop_after)
+        monitor.async_resolver.resolve = AsyncMock(side_effect=_fake_rbl_resolve(listings))
+        with patch("src.utils.dns_helpers.RobustResolver.aget_ip", new=AsyncMock(return_value="1.2.3.4")):
+            return monitor.check_blacklist("example.com"), monitor
+
+    def test_clean_ip_is_ok(self):
+        res, monitor = self._check({})
+        assert res["status"] == "ok"
+        assert res["listed_in"] == []
+        assert monitor.async_resolver.resolve.await_count == 3
+        assert monitor.async_resolver.resolve.await_args_list[0].args[0] == "4.3.2.1.rbl-a.test"
+
+    def test_failed_lookups_not_counted_as_checked(self):
+        monitor = BlacklistMonitor(rbls=["rbl-down-a.test", "rbl-down-b.test"])
+        monitor.async_resolver.resolve = AsyncMock(side_effect=dns.exception.Timeout())
+        with patch("src.utils.dns_helpers.RobustResolver.aget_ip", new=AsyncMock(return_value="1.2.3.4")):
+            res = monitor.check_blacklist("example.com")
+        assert res["status"] == "warning"
+        assert res["checked_rbls"] == 0
+        assert len(res["errors"]) == 2
+
+    def test_listing_is_critical(self):
+        res, _ = self._check({"rbl-b.test": "127.0.0.2"})
+        assert res["status"] == "critical"
+        assert res["listed_in"] == ["rbl-b.test"]
+
+    def test_blocked_and_policy_codes_ignored(self):
+        res, _ = self._check({"rbl-a.test": "127.255.255.254", "rbl-b.test": "127.0.0.10"})
+        assert res["status"] == "ok"
+        assert res["listed_in"] == []
+
+    def test_stop_after_first_listing(self):
+        res, _ = self._check({"rbl-a.test": "127.0.0.2", "rbl-c.test": "127.0.0.2"}, stop_after=1)
+        assert res["status"] == "critical"
+        assert len(res["listed_in"]) == 1
+        assert res["checked_rbls"] < 3
+
+    def test_preresolved_ip_skips_lookup(self):
+        monitor = BlacklistMonitor(rbls=["rbl-a.test"])
+        monitor.async_resolver.resolve = AsyncMock(side_effect=_fake_rbl_resolve({}))
+        with patch("src.utils.dns_helpers.RobustResolver.aget_ip", new=AsyncMock()) as get_ip:
+            res = monitor.check_blacklist("example.com", ip="5.6.7.8")
+        get_ip.assert_not_awaited()
+        assert res["ip"] == "5.6.7.8"
+        assert monitor.async_resolver.resolve.await_args.args[0] == "8.7.6.5.rbl-a.test"
+
+
+class _SlowMonitor(BaseMonitor):
+    monitor_name = "slow"
+
+    def _run_check(self, domain):
+        return self._ok_result("never used")
+
+    async def _run_check_async(self, domain):
+        await asyncio.sleep(10)
+
+
+def test_check_async_budget_turns_into_warning():
+    res = asyncio.run(_SlowMonitor().check_async("example.com", timeout=0.01))
+    assert res["status"] == "warning"
+    assert "timed out" in res["message"]
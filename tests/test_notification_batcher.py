@@ -0,0 +1,58 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+from src.notifications.batcher import BatchingNotifier
+
+
+def _run(alerts, **kwargs):
+    notifier = AsyncMock()
+
+    async def run():
+        batcher = BatchingNotifier(notifier, max_wait=0.05, **kwargs)
+        batcher.start()
+        for alert in alerts:
+            assert batcher.enqueue(*alert)
+        await batcher.stop(timeout=1)
+
+    asyncio.run(run())
+    return notifier.send_notification
+
+
+def test_burst_is_sent_as_one_digest():
+    send = _run([(f"Alert {i}", f"body {i}", "warning") for i in range(4)] + [("Alert X", "bad", "critical")])
+    send.assert_awaited_once()
+    title, message, level = send.await_args.args
+    assert title == "DomainMate: 5 alerts"
+    assert level == "critical"
+    assert "**Alert 0**\nbody 0" in message and "**Alert X**\nbad" in message
+
+
+def test_single_alert_passes_through_unchanged():
+    send = _run([("Title", "Body", "info")])
+    send.assert_awaited_once_with("Title", "Body", "info")
+
+
+def test_batches_are_capped_at_max_batch():
+    send = _run([(f"Alert {i}", "body", "warning") for i in range(5)], max_batch=2)
+    assert send.await_count == 3
+
+
+def test_full_queue_drops_alert():
+    batcher = BatchingNotifier(AsyncMock(), maxsize=1)
+    assert batcher.enqueue("a", "b")
+    assert not batcher.enqueue("c", "d")
+
+
+def test_alert_after_collection_window_is_not_lost():
+    notifier = AsyncMock()
+
+    async def run():
+        batcher = BatchingNotifier(notifier, max_wait=0.05)
+        batcher.start()
+        batcher.enqueue("First", "a", "info")
+        await asyncio.sleep(0.1)
+        batcher.enqueue("Second", "b", "info")
+        await batcher.stop(timeout=1)
+
+    asyncio.run(run())
+    assert [c.args[0] for c in notifier.send_notification.await_args_list] == ["First", "Second"]
@@ -1,5 +1,7 @@
 import asyncio
 import json
+import time
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock
 
 from src.notifications.manager import NotificationManager
@@ -10,7 +12,7 @@ def _critical_result():
 
 
 def _make_manager(tmp_path):
-    manager = NotificationManager(config={}, state_file=str(tmp_path / "state.json"))
+    manager = NotificationManager(config={}, state_file=str(tmp_path / "state.db"))
     manager.service.send_notification = AsyncMock()
     return manager
 
@@ -37,11 +39,108 @@ def test_resolved_issue_removed_from_state(tmp_path):
     assert manager.state
     asyncio.run(manager.process_and_send([]))
     assert manager.state == {}
-    saved = json.loads((tmp_path / "state.json").read_text())
-    assert saved == {}
+
+
+def test_legacy_json_state_imported_once(tmp_path):
+    sent = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+    legacy = {"example.com:ssl": {"first_seen": sent, "last_sent": sent, "count": 2,
+                                  "monitor": "ssl", "domain": "example.com"}}
+    (tmp_path / "state.json").write_text(json.dumps(legacy))
+    manager = _make_manager(tmp_path)
+    assert manager.state["example.com:ssl"]["count"] == 2
+    assert not (tmp_path / "state.json").exists()
+    assert (tmp_path / "state.json.imported").exists()
+    asyncio.run(manager.process_and_send([_critical_result()]))
+    manager.service.send_notification.assert_not_awaited()
 
 
 def test_ok_results_do_not_alert(tmp_path):
     manager = _make_manager(tmp_path)
     asyncio.run(manager.process_and_send([{"domain": "example.com", "monitor": "dns", "status": "ok"}]))
     manager.service.send_notification.assert_not_awaited()
+
+
+def test_one_digest_per_domain_and_failures_isolated(tmp_path):
+    manager = _make_manager(tmp_path)
+    manager.service.send_notification.side_effect = [RuntimeError("boom"), None]
+    results = [_critical_result(), {**_critical_result(), "domain": "example.org"}]
+    asyncio.run(manager.process_and_send(results))
+    assert manager.service.send_notification.await_count == 2
+
+
+def test_state_persists_across_instances(tmp_path):
+    manager = _make_manager(tmp_path)
+    asyncio.run(manager.process_and_send([_critical_result()]))
+    manager.close()
+    reopened = _make_manager(tmp_path)
+    assert reopened.state["example.com:ssl"]["count"] == 1
+    asyncio.run(reopened.process_and_send([_critical_result()]))
+    reopened.service.send_notification.assert_not_awaited()
+
+
+def test_issue_resent_after_24h_with_count(tmp_path):
+    manager = _make_manager(tmp_path)
+    asyncio.run(manager.process_and_send([_critical_result()]))
+    old = time.time() - 25 * 3600
+    with manager.db:
+        manager.db.execute("UPDATE state SET last_sent = ?", (old,))
+    asyncio.run(manager.process_and_send([_critical_result()]))
+    assert manager.service.send_notification.await_count == 2
+    assert "(Repeated 2x)" in manager.service.send_notification.await_args.args[1]
+
+
+def test_digest_message_format(tmp_path):
+    manager = _make_manager(tmp_path)
+    results = [
+        {**_critical_result(), "details": ["a", "b", "c", "d"]},
+        {"domain": "example.com", "monitor": "dns", "status": "warning", "message": "Missing: SPF", "details": "no SPF"},
+    ]
+    asyncio.run(manager.process_and_send(results))
+    message = manager.service.send_notification.await_args.args[1]
+    assert message.splitlines() == [
+        "Found 2 issues for **example.com**:",
+        "[CRIT] **SSL**: Expired (New)",
+        "   - a",
+        "   - b",
+        "   - c",
+        "[WARN] **DNS**: Missing: SPF (New)",
+        "   - no SPF",
+    ]
+
+
+def test_many_domains_collapse_into_one_scan_digest(tmp_path):
+    manager = _make_manager(tmp_path)
+    manager.config = {"notifications": {"digest_threshold": 2}}
+    results = [{**_critical_result(), "domain": f"site{i}.com"} for i in range(3)]
+    asyncio.run(manager.process_and_send(results))
+    manager.service.send_notification.assert_awaited_once()
+    title, message, level = manager.service.send_notification.await_args.args
+    assert title == "Scan digest: 3 domains affected"
+    assert "| site2.com | SSL | critical | Expired |" in message
+    assert level == "critical"
+
+
+def test_scan_digest_is_off_by_default(tmp_path):
+    manager = _make_manager(tmp_path)
+    results = [{**_critical_result(), "domain": f"site{i}.com"} for i in range(8)]
+    asyncio.run(manager.process_and_send(results))
+    assert manager.service.send_notification.await_count == 8
+
+
+def test_domain_digests_are_concurrency_bounded(tmp_path):
+    manager = _make_manager(tmp_path)
+    manager.config = {"notifications": {"max_concurrent_notifications": 2}}
+    running = []
+    peak = []
+
+    async def slow(*args):
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    manager.service.send_notification.side_effect = slow
+    results = [{**_critical_result(), "domain": f"site{i}.com"} for i in range(6)]
+    asyncio.run(manager.process_and_send(results))
+    assert manager.service.send_notification.await_count == 6
+    assert max(peak) == 2
@@ -0,0 +1,193 @@
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.notifications import service as service_module
+from src.notifications.service import NotificationService, ResolvedChannels, SlidingWindowLimiter
+
+_CHANNELS = (
+    "_send_github_issue", "_send_gitlab_issue", "_send_telegram",
+    "_send_teams", "_send_email", "_send_webhook",
+)
+
+
+def _service_with_mock_channels():
+    service = NotificationService()
+    service._enabled = ResolvedChannels(
+        github_token="t", github_repo="r", gitlab_token="t", gitlab_project_id="1",
+        telegram_token="t", telegram_chat_id="c", teams_url="https://t", email_server="s",
+        email_to="e", webhook_url="https://w",
+    ).enabled()
+    for name in _CHANNELS:
+        setattr(service, name, AsyncMock(return_value=True))
+    return service
+
+
+def test_all_channels_are_sent():
+    service = _service_with_mock_channels()
+    asyncio.run(service.send_notification("Title", "Body", "critical"))
+    for name in _CHANNELS:
+        getattr(service, name).assert_awaited_once()
+    service._send_github_issue.assert_awaited_once_with("Title", "Body", "critical")
+    service._send_telegram.assert_awaited_once_with("Title", "Body", "critical")
+
+
+def test_failing_channel_does_not_stop_others():
+    service = _service_with_mock_channels()
+    service._send_github_issue.side_effect = RuntimeError("boom")
+    service._send_email.return_value = False
+    delivered = asyncio.run(service.send_notification("Title", "Body", "critical"))
+    service._send_webhook.assert_awaited_once()
+    assert delivered == [c for c in service._enabled if c not in ("github", "email")]
+
+
+def test_channels_run_concurrently():
+    service = _service_with_mock_channels()
+    running = []
+    peak = []
+
+    async def slow(*args):
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    for name in _CHANNELS:
+        setattr(service, name, slow)
+    asyncio.run(service.send_notification("Title", "Body", "critical"))
+    assert max(peak) == len(_CHANNELS)
+
+
+def test_http_session_is_shared_and_closed():
+    async def run():
+        async with NotificationService() as service:
+            first = await service._ensure_session()
+            assert await service._ensure_session() is first
+        assert first.closed
+        assert service._session is None
+
+    asyncio.run(run())
+
+
+def test_session_from_previous_loop_is_closed():
+    service = NotificationService()
+    first = asyncio.run(service._ensure_session())
+    second = asyncio.run(service._ensure_session())
+    assert second is not first
+    assert first.closed
+    asyncio.run(service.close())
+
+
+def test_sliding_window_limiter_delays_excess_sends():
+    limiter = SlidingWindowLimiter(max_per_window=2, window=0.05)
+
+    async def run():
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.04
+
+
+def test_github_client_is_reused(monkeypatch):
+    monkeypatch.setattr(service_module.settings, "GITHUB_TOKEN", "token")
+    monkeypatch.setattr(service_module.settings, "GITHUB_REPO", "user/repo")
+    service = NotificationService()
+    with patch.object(service_module, "Github") as github:
+        repo = github.return_value.get_repo.return_value
+        asyncio.run(service._send_github_issue("A", "body", "critical"))
+        asyncio.run(service._send_github_issue("B", "body", "critical"))
+    github.assert_called_once_with("token")
+    assert repo.create_issue.call_count == 2
+
+
+def test_email_is_sent_from_worker_thread(monkeypatch):
+    monkeypatch.setattr(service_module.settings, "EMAIL_SMTP_SERVER", "smtp.example.com")
+    monkeypatch.setattr(service_module.settings, "EMAIL_TO", "ops@example.com")
+    threads = []
+    service = NotificationService()
+    with patch.object(service_module.smtplib, "SMTP") as smtp:
+        smtp.return_value.__enter__.return_value.send_message.side_effect = (
+            lambda msg: threads.append(threading.current_thread())
+        )
+        asyncio.run(service._send_email("Title", "Body"))
+    assert threads and threads[0] is not threading.main_thread()
+    sent = smtp.return_value.__enter__.return_value.send_message.call_args.args[0]
+    assert sent["To"] == "ops@example.com"
+
+
+def test_teams_payload(monkeypatch):
+    monkeypatch.setattr(service_module.settings, "TEAMS_WEBHOOK_URL", "https://teams.example.com/hook")
+    service = NotificationService()
+    session = MagicMock()
+    session.post.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+    session.post.return_value.__aexit__ = AsyncMock(return_value=False)
+    service._ensure_session = AsyncMock(return_value=session)
+    asyncio.run(service._send_teams("Title", "Body", "critical"))
+    payload = session.post.call_args.kwargs["json"]
+    assert payload["@type"] == "MessageCard"
+    assert payload["themeColor"] == "FF0000"
+    assert payload["sections"][0] == {"activityTitle": "Title", "activitySubtitle": "Level: critical", "text": "Body"}
+
+
+def test_unconfigured_channels_are_not_scheduled(monkeypatch):
+    monkeypatch.setattr(service_module.settings, "TELEGRAM_BOT_TOKEN", "token")
+    monkeypatch.setattr(service_module.settings, "TELEGRAM_CHAT_ID", "42")
+    monkeypatch.setattr(service_module.settings, "GENERIC_WEBHOOK_URL", "http://insecure.example.com")
+    service = NotificationService()
+    assert service._enabled == ("telegram",)
+    assert service._cfg.webhook_url is None
+
+
+def test_identical_notification_sent_once_within_window():
+    service = _service_with_mock_channels()
+    asyncio.run(service.send_notification("Title", "Body", "warning"))
+    asyncio.run(service.send_notification("Title", "Body", "warning"))
+    asyncio.run(service.send_notification("Title", "Other body", "warning"))
+    assert service._send_webhook.await_count == 2
+
+
+def test_issue_trackers_skipped_for_non_critical():
+    service = _service_with_mock_channels()
+    asyncio.run(service.send_notification("Title", "Body", "warning"))
+    service._send_github_issue.assert_not_awaited()
+    service._send_gitlab_issue.assert_not_awaited()
+    service._send_telegram.assert_awaited_once_with("Title", "Body", "warning")
+
+
+def test_failed_delivery_is_not_deduplicated():
+    service = _service_with_mock_channels()
+    for name in _CHANNELS:
+        getattr(service, name).return_value = False
+    asyncio.run(service.send_notification("Title", "Body", "warning"))
+    asyncio.run(service.send_notification("Title", "Body", "warning"))
+    assert service._send_webhook.await_count == 2
+
+
+def test_concurrent_identical_notifications_sent_once():
+    service = _service_with_mock_channels()
+
+    async def slow_webhook(*args):
+        await asyncio.sleep(0.01)
+        return True
+
+    service._send_webhook = AsyncMock(side_effect=slow_webhook)
+
+    async def main():
+        return await asyncio.gather(
+            service.send_notification("Title", "Body", "warning"),
+            service.send_notification("Title", "Body", "warning"),
+        )
+
+    first, second = asyncio.run(main())
+    assert service._send_webhook.await_count == 1
+    assert "webhook" in first and second == []
+
+
+def test_dedup_can_be_disabled():
+    service = _service_with_mock_channels()
+    asyncio.run(service.send_notification("Test", "Body", "info", dedup=False))
+    asyncio.run(service.send_notification("Test", "Body", "info", dedup=False))
+    assert service._send_webhook.await_count == 2